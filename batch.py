@@ -0,0 +1,63 @@
+import numpy as np
+from types import SimpleNamespace
+from solvers import EQUATIONS, build_solvers
+
+# NumPy ufunc counterparts of the math functions the solvers use.
+UFUNCS = SimpleNamespace(
+    exp=np.exp,
+    log=np.log,
+    log10=np.log10,
+    sqrt=np.sqrt,
+    sin=np.sin,
+    asin=np.arcsin,
+    radians=np.radians,
+    degrees=np.degrees,
+    pow=np.power,
+)
+
+# Solvers that evaluate a whole column of rows in one pass.
+BATCH_SOLVERS = build_solvers(UFUNCS)
+
+
+def column_names(columns):
+    # Structured arrays keep their field names on the dtype, mappings and
+    # DataFrames expose them as keys.
+    names = getattr(getattr(columns, "dtype", None), "names", None)
+    if names is not None:
+        return list(names)
+    return list(columns.keys())
+
+
+def missing_variable(equation, columns):
+    # The missing variable is the one equation variable with no input column.
+    _, variables = EQUATIONS[equation]
+    names = set(column_names(columns))
+    missing = [var for var in variables if var not in names]
+    if len(missing) != 1:
+        raise ValueError(f"Expected exactly one missing variable for {equation}, got {missing}.")
+    return missing[0]
+
+
+def solve_batch(equation, columns, missing_var=None, masked=False):
+    # Solve for the missing variable of every row at once. Columns can be a
+    # mapping of arrays, a structured array or a DataFrame. Rows that fall
+    # outside the domain of the equation (log of a non-positive number,
+    # division by zero, ...) come back as NaN rather than aborting the batch.
+    if missing_var is None:
+        missing_var = missing_variable(equation, columns)
+    try:
+        solver = BATCH_SOLVERS[(equation, missing_var)]
+    except KeyError:
+        raise ValueError(f"No solver for {missing_var} in {equation}.") from None
+
+    _, variables = EQUATIONS[equation]
+    values = {var: np.asarray(columns[var], dtype=float) for var in variables if var != missing_var}
+    shape = np.broadcast_shapes(*(value.shape for value in values.values()))
+
+    with np.errstate(all="ignore"):
+        result = np.array(np.broadcast_to(solver(values), shape), dtype=float)
+    result[~np.isfinite(result)] = np.nan
+
+    if masked:
+        return np.ma.masked_invalid(result)
+    return result
@@ -1,14 +1,23 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from matplotlib.colors import Normalize
-from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
+from simwindow import FigureWindow
+from sweep import SweepWindow
 
-class ClausiusClapeyronApp:
+R = 8.314  # J/(mol K)
+
+
+def vapor_pressure(L, T1, P1, T2):
+    # Clausius-Clapeyron vapor pressure at T2 in kPa. The arguments broadcast,
+    # so a whole grid of L, T1, P1 and T2 is evaluated in one call.
+    return P1 * np.exp(-L / R * (1 / T2 - 1 / T1)) / 1000  # Convert Pa to kPa
+
+class ClausiusClapeyronApp(FigureWindow):
     def __init__(self, root):
         # Initialize the Clausius-Clapeyron App with a root window.
+        super().__init__(root)
         self.root = root
         self.root.title("Clausius-Clapeyron Equation Visualization")
         
@@ -18,80 +27,100 @@ class ClausiusClapeyronApp:
 
         # Create widgets and plot.
         self.create_widgets()
-        self.plot()
+        self.create_plot()
+        self.run_update()
 
     def create_widgets(self):
         # Create labels and scales for user input parameters.
         ttk.Label(self.frame, text="Latent Heat (L, J/mol):").grid(row=0, column=0, padx=5, pady=5, sticky='e')
         self.l_var = tk.DoubleVar(value=40000)
-        ttk.Scale(self.frame, variable=self.l_var, from_=20000, to_=80000, orient='horizontal').grid(row=0, column=1, padx=5, pady=5)
+        ttk.Scale(self.frame, variable=self.l_var, from_=20000, to_=80000, orient='horizontal', command=self.request_update).grid(row=0, column=1, padx=5, pady=5)
 
         ttk.Label(self.frame, text="Initial Temperature (T1, K):").grid(row=1, column=0, padx=5, pady=5, sticky='e')
         self.t1_var = tk.DoubleVar(value=298)
-        ttk.Scale(self.frame, variable=self.t1_var, from_=250, to_=350, orient='horizontal').grid(row=1, column=1, padx=5, pady=5)
+        ttk.Scale(self.frame, variable=self.t1_var, from_=250, to_=350, orient='horizontal', command=self.request_update).grid(row=1, column=1, padx=5, pady=5)
 
         ttk.Label(self.frame, text="Initial Pressure (P1, Pa):").grid(row=2, column=0, padx=5, pady=5, sticky='e')
         self.p1_var = tk.DoubleVar(value=101325)
-        ttk.Scale(self.frame, variable=self.p1_var, from_=50000, to_=200000, orient='horizontal').grid(row=2, column=1, padx=5, pady=5)
+        ttk.Scale(self.frame, variable=self.p1_var, from_=50000, to_=200000, orient='horizontal', command=self.request_update).grid(row=2, column=1, padx=5, pady=5)
 
-        # Create a button to update the plot.
-        ttk.Button(self.frame, text="Update Plot", command=self.plot).grid(row=3, column=0, columnspan=2, pady=10)
+        # Create a button to sweep the parameters over a grid.
+        ttk.Button(self.frame, text="Sweep...", command=self.open_sweep).grid(row=3, column=0, columnspan=2, pady=10)
 
-    def plot(self):
-        # Retrieve user input values.
-        L = self.l_var.get()
-        T1 = self.t1_var.get()
+    def open_sweep(self):
+        # P2 over a grid of L, T1 and P1; P1 starts fixed at its slider value.
         P1 = self.p1_var.get()
-        R = 8.314  # J/(mol K)
+        SweepWindow(self.root, "Clausius-Clapeyron Sweep",
+                    [("L", "Latent Heat (L, J/mol)", 20000, 80000, 1000), ("T1", "Initial Temperature (T1, K)", 250, 350, 1000),
+                     ("P1", "Initial Pressure (P1, Pa)", P1, P1, 1)],
+                    "Temperature (K)", np.linspace(250, 400, 500), 350, "Vapor Pressure (kPa)", vapor_pressure)
+
+    def create_plot(self):
+        # Create the figure, canvas and artists once; update_state() only
+        # updates them. The temperatures are fixed, so the segment colors are
+        # set here too. The curve and annotations are animated: slider drags
+        # redraw just them over the saved background.
+        self.T2 = np.linspace(250, 400, 500)
+        self.ax = self.create_figure(self.frame, figsize=(10, 6))
+        self.figure.patch.set_facecolor('white')
+        self.ax.set_facecolor('white')
+
+        # One colormapped collection holds all 499 segments of the curve.
+        norm = Normalize(vmin=min(self.T2), vmax=max(self.T2))
+        self.curve = self.animate(LineCollection([], cmap='viridis', norm=norm))
+        self.curve.set_array(self.T2[:-1])
+        self.ax.add_collection(self.curve)
 
-        # Calculate corresponding temperatures and pressures using the Clausius-Clapeyron equation.
-        T2 = np.linspace(250, 400, 500)
-        P2 = P1 * np.exp(-L/R * (1/T2 - 1/T1)) / 1000  # Convert Pa to kPa
+        # Add a color bar to the plot.
+        cbar = self.figure.colorbar(self.curve, ax=self.ax)
+        cbar.set_label('Temperature (K)')
 
-        # Create a plot.
-        fig, ax = plt.subplots(figsize=(10, 6))
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('white')
-        norm = Normalize(vmin=min(T2), vmax=max(T2))
-        sm = ScalarMappable(cmap='viridis', norm=norm)
-        sm.set_array([])
+        # Annotations at every tenth of the curve, moved and relabelled by update_state().
+        step = len(self.T2) // 10
+        self.annotated = np.arange(0, len(self.T2), step)
+        self.annotations = [self.animate(self.ax.annotate('', (self.T2[i], 0), textcoords="offset points", xytext=(0,10), ha='center', fontsize=8, color='blue'))
+                            for i in self.annotated]
 
-        # Plot the data points and color them based on temperature.
-        for i in range(len(T2)-1):
-            ax.plot(T2[i:i+2], P2[i:i+2], color=sm.to_rgba(T2[i]))
+        self.ax.set_title("Clausius-Clapeyron Equation: Vapor Pressure vs. Temperature")
+        self.ax.set_xlabel("Temperature (K)")
+        self.ax.set_ylabel("Vapor Pressure (kPa)")
+        self.ax.grid(True)
+        self.ax.set_xlim(min(self.T2), max(self.T2))
 
-        # Add a color bar to the plot.
-        cbar = fig.colorbar(sm, ax=ax)
-        cbar.set_label('Temperature (K)')
+        self.figure.subplots_adjust(left=0.1, bottom=0.2)
+        self.ax.set_xticks(np.arange(min(self.T2), max(self.T2)+1, 10))
+        self.ax.tick_params(axis='x', labelrotation=45)
+        for label in self.ax.get_xticklabels():
+            label.set_horizontalalignment('right')
 
-        
-        # Adding annotations
-        step = len(T2) // 10
-        for i in range(0, len(T2), step):
-            ax.annotate(f'{P2[i]:.2f} kPa', (T2[i], P2[i]), textcoords="offset points", xytext=(0,10), ha='center', fontsize=8, color='blue')
+        self.canvas.get_tk_widget().grid(row=4, column=0, columnspan=2)
 
-        ax.set_title("Clausius-Clapeyron Equation: Vapor Pressure vs. Temperature")
-        ax.set_xlabel("Temperature (K)")
-        ax.set_ylabel("Vapor Pressure (kPa)")
-        ax.grid(True)
+    def update_state(self):
+        # Retrieve user input values.
+        L = self.l_var.get()
+        T1 = self.t1_var.get()
+        P1 = self.p1_var.get()
 
-        # Adjusting y-axis intervals
-        max_pressure = max(P2)
-        interval = max_pressure / 10
-        ax.set_yticks(np.arange(0, max_pressure + interval, interval))
+        # Calculate corresponding pressures using the Clausius-Clapeyron equation.
+        P2 = vapor_pressure(L, T1, P1, self.T2)
 
-        # Make plot interactive
-        plt.subplots_adjust(left=0.1, bottom=0.2)
-        plt.xticks(np.arange(min(T2), max(T2)+1, 10))
-        plt.setp(ax.get_xticklabels(), rotation=45, horizontalalignment='right')
+        # Segment i joins points i and i + 1 of the curve.
+        points = np.column_stack((self.T2, P2))
+        self.curve.set_segments(np.stack((points[:-1], points[1:]), axis=1))
 
-        for widget in self.frame.winfo_children():
-            if isinstance(widget, FigureCanvasTkAgg):
-                widget.get_tk_widget().destroy()
+        for annotation, i in zip(self.annotations, self.annotated):
+            annotation.xy = (self.T2[i], P2[i])
+            annotation.set_text(f'{P2[i]:.2f} kPa')
 
-        canvas = FigureCanvasTkAgg(fig, master=self.frame)
-        canvas.draw()
-        canvas.get_tk_widget().grid(row=4, column=0, columnspan=2)
+        # Adjusting y-axis intervals when the curve no longer fits the axes
+        # nicely; that needs a full redraw.
+        max_pressure = max(P2)
+        top = self.ax.get_ylim()[1]
+        if self.needs_full_draw or max_pressure * 1.05 > top or max_pressure * 1.05 < top / 4:
+            interval = max_pressure / 10
+            self.ax.set_yticks(np.arange(0, max_pressure + interval, interval))
+            self.ax.set_ylim(0, max_pressure + interval)
+            self.invalidate()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,81 @@
+import argparse
+import sys
+import time
+from gasengine import IdealGasEngine
+from parallelgas import ParallelIdealGasEngine
+from solvers import solve
+
+
+def pressure_check(num_particles=10000, steps=2000, burn_in=100, width=350, height=350, speed=5.0, seed=None):
+    # Run the ideal gas engine with no display, measure the pressure from the
+    # momentum the particles deliver to the walls, and compare it with the
+    # pressure the calculator's Ideal Gas Law solver gives for the same state.
+    # In engine units n is the number of particles, R is 1 and T is the mean
+    # kinetic energy per particle.
+    engine = IdealGasEngine(num_particles, width, height, speed, seed=seed)
+    for _ in range(burn_in):
+        engine.step()
+    engine.reset_pressure()
+    for _ in range(steps):
+        engine.step()
+
+    measured = engine.measured_pressure()
+    predicted = solve("Ideal Gas Law", "P", {"V": engine.area(), "n": engine.num_particles, "R": 1.0, "T": engine.temperature()})
+    return measured, predicted
+
+
+def benchmark(sizes, seconds=1.0, seed=0, workers=None):
+    # Time the engine's step for each particle count. Each size runs for about
+    # the given number of seconds after one warm-up step. Yields the particle
+    # count, the number of steps run and the particle-steps per second. With
+    # workers set, the multi-process engine is timed instead.
+    for num_particles in sizes:
+        if workers:
+            engine = ParallelIdealGasEngine(num_particles, 350, 350, 5.0, seed=seed, workers=workers)
+        else:
+            engine = IdealGasEngine(num_particles, 350, 350, 5.0, seed=seed)
+        try:
+            engine.step()
+            steps = 0
+            start = time.perf_counter()
+            elapsed = 0.0
+            while elapsed < seconds:
+                engine.step()
+                steps += 1
+                elapsed = time.perf_counter() - start
+        finally:
+            if workers:
+                engine.close()
+        yield num_particles, steps, num_particles * steps / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ideal gas engine without a display.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("pressure", help="Compare the measured wall pressure with the Ideal Gas Law.")
+    check.add_argument("--particles", type=int, default=10000, help="Number of particles (default 10000).")
+    check.add_argument("--steps", type=int, default=2000, help="Steps to measure over (default 2000).")
+    check.add_argument("--seed", type=int, help="Random seed.")
+
+    bench = commands.add_parser("benchmark", help="Report particle-steps per second for a range of particle counts.")
+    bench.add_argument("sizes", nargs="*", type=int, default=[10 ** k for k in range(2, 7)],
+                       help="Particle counts to time (default 100 to 1000000 in decades).")
+    bench.add_argument("--seconds", type=float, default=1.0, help="Time spent on each size (default 1).")
+    bench.add_argument("--workers", type=int, help="Step with this many worker processes over shared memory.")
+    args = parser.parse_args(argv)
+
+    if args.command == "pressure":
+        measured, predicted = pressure_check(args.particles, args.steps, seed=args.seed)
+        print(f"measured pressure:  {measured:.6g}")
+        print(f"ideal gas law:      {predicted:.6g}")
+        print(f"relative deviation: {measured / predicted - 1:+.3%}")
+    else:
+        print(f"{'particles':>10} {'steps':>8} {'particle-steps/s':>18}")
+        for num_particles, steps, rate in benchmark(args.sizes, args.seconds, workers=args.workers):
+            print(f"{num_particles:>10} {steps:>8} {rate:>18.4g}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
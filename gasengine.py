@@ -0,0 +1,175 @@
+import math
+import numpy as np
+
+
+def berendsen_factor(mean_square_speed, target, dt, tau):
+    # Velocity scale factor of the Berendsen thermostat: relaxes the mean
+    # square speed towards target with time constant tau over a step dt.
+    if mean_square_speed <= 0:
+        return 1.0
+    return math.sqrt(max(1 + dt / tau * (target / mean_square_speed - 1), 0.0))
+
+
+def maxwell_boltzmann(rng, num_particles, speed):
+    # Velocities drawn from the 2D Maxwell-Boltzmann distribution: each
+    # component is normal with variance T for unit mass and Boltzmann constant.
+    # speed is the slider-derived speed the engines take. T = speed^2 / 3 keeps
+    # the mean kinetic energy of the uniform [-speed, speed] draw used before.
+    return rng.normal(0.0, speed / math.sqrt(3), size=(num_particles, 2))
+
+
+def rescale_positions(positions, radius, old_size, new_size):
+    # Map particle centres from a box of old_size onto one of new_size in
+    # place, keeping them the same fraction of the way between the walls.
+    for axis in range(2):
+        positions[:, axis] -= radius
+        positions[:, axis] *= (new_size[axis] - 2 * radius) / (old_size[axis] - 2 * radius)
+        positions[:, axis] += radius
+
+
+def free_flight_step(positions, velocities, lower, upper, dt, below, above, hits):
+    # Advance every particle by dt, then reflect any that crossed a wall back
+    # inside the box and reverse the velocity component normal to that wall.
+    # Works in place on any block of particles, with below, above and hits as
+    # scratch masks of the same shape, and returns the momentum handed to the
+    # walls.
+    positions += velocities * dt
+    np.less(positions, lower, out=below)
+    np.greater(positions, upper, out=above)
+    np.subtract(2 * lower, positions, out=positions, where=below)
+    np.subtract(2 * upper, positions, out=positions, where=above)
+    np.logical_or(below, above, out=hits)
+    impulse = 2 * np.abs(velocities[hits]).sum()
+    np.negative(velocities, out=velocities, where=hits)
+
+    # A particle moving further than the width of the box in one step is
+    # still outside after one reflection. That needs a velocity component
+    # above the span over dt, which two reductions rule out; otherwise the
+    # particles still outside are reflected again until none is.
+    span = np.min(np.subtract(upper, lower))
+    if len(velocities) and max(velocities.max(), -velocities.min()) * dt > span:
+        while True:
+            np.less(positions, lower, out=below)
+            np.greater(positions, upper, out=above)
+            np.logical_or(below, above, out=hits)
+            if not hits.any():
+                break
+            np.subtract(2 * lower, positions, out=positions, where=below)
+            np.subtract(2 * upper, positions, out=positions, where=above)
+            impulse += 2 * np.abs(velocities[hits]).sum()
+            np.negative(velocities, out=velocities, where=hits)
+    return impulse
+
+
+class IdealGasEngine:
+    # Particle state for the ideal gas simulation, held in contiguous float64
+    # arrays so a whole step is a handful of vectorized operations. Positions
+    # and velocities have shape (N, 2); the box spans [0, width] x [0, height]
+    # and particles bounce off its walls. The engine knows nothing about Tk, so
+    # any view can read positions after each step, or none at all.
+    #
+    # Particles have unit mass and the Boltzmann constant is 1, so the kinetic
+    # temperature is the mean kinetic energy per particle (two degrees of
+    # freedom in 2D). Every bounce hands 2*|v| of momentum to the wall, and the
+    # momentum delivered per unit time and unit length of wall is the measured
+    # pressure, which the ideal gas law predicts as N*T / area.
+    def __init__(self, num_particles, width, height, speed, radius=3.0, seed=None):
+        self.width = float(width)
+        self.height = float(height)
+        self.radius = float(radius)
+        self.rng = np.random.default_rng(seed)
+
+        # Centres stay at least one radius away from each wall.
+        self.lower = np.array([self.radius, self.radius])
+        self.upper = np.array([self.width - self.radius, self.height - self.radius])
+
+        self.positions = self.rng.uniform(self.lower, self.upper, size=(num_particles, 2))
+        self.velocities = maxwell_boltzmann(self.rng, num_particles, speed)
+
+        # Scratch masks reused every step so the physics loop does not allocate.
+        self._below = np.empty((num_particles, 2), dtype=bool)
+        self._above = np.empty((num_particles, 2), dtype=bool)
+        self._hits = np.empty((num_particles, 2), dtype=bool)
+
+        self.time = 0.0
+        self.reset_pressure()
+
+    @property
+    def num_particles(self):
+        return len(self.positions)
+
+    def step(self, dt=1.0):
+        self.wall_impulse += free_flight_step(self.positions, self.velocities, self.lower, self.upper, dt,
+                                              self._below, self._above, self._hits)
+        self.time += dt
+
+    def area(self):
+        # Area the particle centres can reach.
+        return (self.width - 2 * self.radius) * (self.height - 2 * self.radius)
+
+    def temperature(self):
+        return float(np.einsum("ij,ij->", self.velocities, self.velocities)) / (2 * max(self.num_particles, 1))
+
+    def reset_pressure(self):
+        # Start a new pressure measurement from the current time.
+        self.wall_impulse = 0.0
+        self.pressure_start = self.time
+
+    def measured_pressure(self):
+        # Momentum delivered to the walls per unit time and unit wall length
+        # since the last reset_pressure().
+        elapsed = self.time - self.pressure_start
+        perimeter = 2 * ((self.width - 2 * self.radius) + (self.height - 2 * self.radius))
+        return self.wall_impulse / (elapsed * perimeter) if elapsed > 0 else math.nan
+
+    def scale_velocities(self, factor):
+        # Thermostat hook: multiply every velocity by factor.
+        self.velocities *= factor
+
+    def resize(self, width, height):
+        # Move the walls, carrying the particles along so they stay inside.
+        rescale_positions(self.positions, self.radius, (self.width, self.height), (width, height))
+        self.width = float(width)
+        self.height = float(height)
+        self.upper[:] = [self.width - self.radius, self.height - self.radius]
+        self.reset_pressure()
+
+
+class SpeedHistogram:
+    # Speed distribution over the last window frames, kept up to date
+    # incrementally. The bins are fixed, so each frame costs one bincount over
+    # the particles. The counts of each frame are kept in a ring buffer, and
+    # the frame leaving the window is subtracted from the running total rather
+    # than histogramming the whole history again. Speeds above max_speed get
+    # no bar but are counted in an extra overflow bin, so the density stays
+    # normalized over every sample.
+    def __init__(self, bins, max_speed, window=50):
+        self.bins = int(bins)
+        self.max_speed = float(max_speed)
+        self.edges = np.linspace(0.0, self.max_speed, self.bins + 1)
+        self.ring = np.zeros((int(window), self.bins + 1), dtype=np.int64)
+        self.total = np.zeros(self.bins + 1, dtype=np.int64)
+        self.position = 0
+        self.frames = 0
+
+    def update(self, velocities):
+        speeds = np.sqrt(np.einsum("ij,ij->i", velocities, velocities))
+        index = (speeds * (self.bins / self.max_speed)).astype(np.intp)
+        counts = np.bincount(np.minimum(index, self.bins), minlength=self.bins + 1)
+        self.total += counts - self.ring[self.position]
+        self.ring[self.position] = counts
+        self.position = (self.position + 1) % len(self.ring)
+        self.frames = min(self.frames + 1, len(self.ring))
+
+    def density(self):
+        # Probability density per unit speed over the window, for the bins
+        # below max_speed.
+        samples = self.total.sum()
+        width = self.max_speed / self.bins
+        return self.total[:self.bins] / (samples * width) if samples else np.zeros(self.bins)
+
+
+def maxwell_boltzmann_density(speed, temperature):
+    # 2D Maxwell-Boltzmann speed distribution for unit mass and Boltzmann constant.
+    return speed / temperature * np.exp(-speed * speed / (2 * temperature))
+
@@ -0,0 +1,276 @@
+import heapq
+import itertools
+import math
+import numpy as np
+from gasengine import maxwell_boltzmann, rescale_positions
+
+# Event kinds. Ties in time are broken by a sequence number, never by kind.
+WALL, PAIR, CELL = 0, 1, 2
+
+
+class HardSphereEngine:
+    # Event-driven molecular dynamics for hard discs in a box. Instead of
+    # sub-stepping, predicted particle-particle, particle-wall and cell-crossing
+    # events go into a heap and the simulation jumps from one event to the next,
+    # so collisions are exact whatever the time step.
+    #
+    # Particles only look for collision partners in the 3x3 block of cells
+    # around them, and every particle carries a collision count: an event
+    # remembers the counts it was predicted with and is discarded as stale if
+    # either particle has collided since. Each event therefore costs O(log N).
+    #
+    # Each particle's position is stored at the time of its last event and
+    # extrapolated on demand, so an event only touches the particles involved.
+    # step(dt) has the same meaning as for IdealGasEngine and refreshes the
+    # positions and velocities arrays for the view at the end of each step.
+    def __init__(self, num_particles, width, height, speed, radius=3.0, seed=None):
+        self.width = float(width)
+        self.height = float(height)
+        self.radius = float(radius)
+        self.diameter = 2 * self.radius
+        self.rng = np.random.default_rng(seed)
+
+        positions = self.place_particles(num_particles)
+        velocities = maxwell_boltzmann(self.rng, num_particles, speed)
+        self.load_state(positions, velocities)
+
+    @property
+    def num_particles(self):
+        return len(self.x)
+
+    def place_particles(self, num_particles):
+        # Random sites on a lattice spaced just over one diameter apart, so no
+        # two discs start overlapping.
+        spacing = self.diameter * 1.001
+        nx = int((self.width - self.diameter) // spacing) + 1
+        ny = int((self.height - self.diameter) // spacing) + 1
+        if num_particles > nx * ny:
+            raise ValueError(f"{num_particles} discs of radius {self.radius} do not fit in the box.")
+        sites = self.rng.choice(nx * ny, size=num_particles, replace=False)
+        return np.column_stack([self.radius + (sites // ny) * spacing, self.radius + (sites % ny) * spacing])
+
+    def load_state(self, positions, velocities, time=0.0):
+        # Replace the particle state and predict every event from scratch.
+        # Per-particle state is kept in plain lists: the event loop touches one
+        # or two particles at a time, where Python floats beat NumPy scalars.
+        self.time = float(time)
+        self.x, self.y = positions[:, 0].tolist(), positions[:, 1].tolist()
+        self.vx, self.vy = velocities[:, 0].tolist(), velocities[:, 1].tolist()
+        self.t_last = [self.time] * len(self.x)
+        self.count = [0] * len(self.x)
+        self.collisions = 0
+
+        # Cells are at least one diameter wide, so any collision partner is in
+        # a neighbouring cell, and about one particle each on average.
+        cell_size = max(self.diameter, math.sqrt(self.width * self.height / max(len(self.x), 1)))
+        self.nx = max(1, int(self.width // cell_size))
+        self.ny = max(1, int(self.height // cell_size))
+        self.cell_w = self.width / self.nx
+        self.cell_h = self.height / self.ny
+        self.cx = [min(int(x // self.cell_w), self.nx - 1) for x in self.x]
+        self.cy = [min(int(y // self.cell_h), self.ny - 1) for y in self.y]
+        self.cells = [set() for _ in range(self.nx * self.ny)]
+        for i, (cx, cy) in enumerate(zip(self.cx, self.cy)):
+            self.cells[cx * self.ny + cy].add(i)
+
+        self.positions = np.array(positions, dtype=float)
+        self.velocities = np.array(velocities, dtype=float)
+        self.rebuild_events()
+
+    def rebuild_events(self):
+        # Bring every particle to the current time and predict all events again.
+        # Also used to drop the stale events that pile up in the heap.
+        for i in range(len(self.x)):
+            self.move_to_now(i)
+        self.events = []
+        self.sequence = itertools.count()
+        for i in range(len(self.x)):
+            self.predict(i)
+
+    def move_to_now(self, i):
+        dt = self.time - self.t_last[i]
+        if dt:
+            self.x[i] += self.vx[i] * dt
+            self.y[i] += self.vy[i] * dt
+            self.t_last[i] = self.time
+
+    def push(self, time, kind, i, other, count_other):
+        heapq.heappush(self.events, (time, next(self.sequence), kind, i, other, self.count[i], count_other))
+
+    def predict(self, i):
+        # Queue the next wall hit, the next cell crossing and every collision
+        # with particles in the surrounding cells. Particle i must be at the
+        # current time.
+        self.predict_wall(i)
+        self.predict_cell(i)
+        self.predict_pairs(i)
+
+    def predict_wall(self, i):
+        r = self.radius
+        best_t, best_axis = math.inf, 0
+        for axis, pos, vel, size in ((0, self.x[i], self.vx[i], self.width), (1, self.y[i], self.vy[i], self.height)):
+            if vel > 0:
+                t = (size - r - pos) / vel
+            elif vel < 0:
+                t = (r - pos) / vel
+            else:
+                continue
+            if t < best_t:
+                best_t, best_axis = t, axis
+        if best_t < math.inf:
+            self.push(self.time + max(best_t, 0.0), WALL, i, best_axis, 0)
+
+    def predict_cell(self, i):
+        # Cells on the edge of the grid have no neighbour towards the wall, so
+        # the wall event covers that direction.
+        best_t, best_axis, best_step = math.inf, 0, 0
+        for axis, pos, vel, cell, cells, cell_size in (
+            (0, self.x[i], self.vx[i], self.cx[i], self.nx, self.cell_w),
+            (1, self.y[i], self.vy[i], self.cy[i], self.ny, self.cell_h),
+        ):
+            if vel > 0 and cell < cells - 1:
+                t, step = ((cell + 1) * cell_size - pos) / vel, 1
+            elif vel < 0 and cell > 0:
+                t, step = (cell * cell_size - pos) / vel, -1
+            else:
+                continue
+            if t < best_t:
+                best_t, best_axis, best_step = t, axis, step
+        if best_t < math.inf:
+            self.push(self.time + max(best_t, 0.0), CELL, i, best_axis, best_step)
+
+    def predict_pairs(self, i, axis=None, step=0):
+        # Collisions with particles in the 3x3 block of cells around i. After a
+        # cell crossing along axis in direction step, only the row or column of
+        # cells that has just come into range needs checking.
+        xs, ys, vxs, vys, t_last, counts = self.x, self.y, self.vx, self.vy, self.t_last, self.count
+        x, y, vx, vy = xs[i], ys[i], vxs[i], vys[i]
+        sigma2 = self.diameter * self.diameter
+        now = self.time
+        cx, cy, ny_cells, cells = self.cx[i], self.cy[i], self.ny, self.cells
+
+        x_cells = range(max(cx - 1, 0), min(cx + 2, self.nx))
+        y_cells = range(max(cy - 1, 0), min(cy + 2, ny_cells))
+        if axis == 0:
+            x_cells = [c for c in (cx + step,) if 0 <= c < self.nx]
+        elif axis == 1:
+            y_cells = [c for c in (cy + step,) if 0 <= c < ny_cells]
+
+        for nx in x_cells:
+            for ny in y_cells:
+                for j in cells[nx * ny_cells + ny]:
+                    if j == i:
+                        continue
+                    dvx = vxs[j] - vx
+                    dvy = vys[j] - vy
+                    dt_j = now - t_last[j]
+                    dx = xs[j] + vxs[j] * dt_j - x
+                    dy = ys[j] + vys[j] * dt_j - y
+                    b = dx * dvx + dy * dvy
+                    if b >= 0:
+                        continue  # moving apart
+                    dv2 = dvx * dvx + dvy * dvy
+                    disc = b * b - dv2 * (dx * dx + dy * dy - sigma2)
+                    if disc <= 0:
+                        continue  # miss
+                    t = -(b + math.sqrt(disc)) / dv2
+                    self.push(now + (t if t > 0 else 0.0), PAIR, i, j, counts[j])
+
+    def process_next_event(self, until=math.inf):
+        # Pop and apply the next valid event if it happens no later than until.
+        # Returns False when there is none; a later event is left queued.
+        events = self.events
+        while events:
+            time, _, kind, i, other, count_i, count_other = events[0]
+            if self.count[i] != count_i or (kind == PAIR and self.count[other] != count_other):
+                heapq.heappop(events)
+                continue  # stale: a particle involved has collided since
+            if time > until:
+                return False
+            heapq.heappop(events)
+            self.time = time
+            self.move_to_now(i)
+
+            if kind == WALL:
+                if other == 0:
+                    self.vx[i] = -self.vx[i]
+                else:
+                    self.vy[i] = -self.vy[i]
+                self.count[i] += 1
+                self.predict(i)
+
+            elif kind == PAIR:
+                j = other
+                self.move_to_now(j)
+                # Equal-mass elastic collision: exchange the velocity component
+                # along the line of centres.
+                dx, dy = self.x[j] - self.x[i], self.y[j] - self.y[i]
+                dvx, dvy = self.vx[j] - self.vx[i], self.vy[j] - self.vy[i]
+                impulse = (dx * dvx + dy * dvy) / (dx * dx + dy * dy)
+                self.vx[i] += impulse * dx
+                self.vy[i] += impulse * dy
+                self.vx[j] -= impulse * dx
+                self.vy[j] -= impulse * dy
+                self.count[i] += 1
+                self.count[j] += 1
+                self.collisions += 1
+                self.predict(i)
+                self.predict(j)
+
+            else:
+                # Cell crossing: move to the neighbouring cell and look for
+                # partners among the particles that have just come into range.
+                self.cells[self.cx[i] * self.ny + self.cy[i]].discard(i)
+                if other == 0:
+                    self.cx[i] += count_other
+                else:
+                    self.cy[i] += count_other
+                self.cells[self.cx[i] * self.ny + self.cy[i]].add(i)
+                # Velocity is unchanged, so the queued wall event stays valid.
+                self.predict_cell(i)
+                self.predict_pairs(i, other, count_other)
+            return True
+        return False
+
+    def scale_velocities(self, factor):
+        # Scaling every velocity by factor is the same as running the clock
+        # factor times faster, so every queued event stays valid and only its
+        # time moves closer to or further from now.
+        for i in range(len(self.x)):
+            self.move_to_now(i)
+        self.vx = [v * factor for v in self.vx]
+        self.vy = [v * factor for v in self.vy]
+        self.velocities *= factor
+        now = self.time
+        self.events = [(now + (event[0] - now) / factor,) + event[1:] for event in self.events]
+        heapq.heapify(self.events)
+
+    def resize(self, width, height):
+        # Move the walls, carrying the particles along, and predict everything
+        # again in the new box.
+        for i in range(len(self.x)):
+            self.move_to_now(i)
+        positions = np.column_stack([self.x, self.y])
+        velocities = np.column_stack([self.vx, self.vy])
+        rescale_positions(positions, self.radius, (self.width, self.height), (width, height))
+        self.width = float(width)
+        self.height = float(height)
+        collisions = self.collisions
+        self.load_state(positions, velocities, self.time)
+        self.collisions = collisions
+
+    def step(self, dt=1.0):
+        # Process every event up to time + dt, then refresh the view arrays.
+        end = self.time + dt
+        while self.process_next_event(end):
+            pass
+        self.time = end
+
+        if len(self.events) > 16 * len(self.x) + 1024:
+            self.rebuild_events()
+
+        elapsed = end - np.array(self.t_last)
+        self.velocities[:, 0] = self.vx
+        self.velocities[:, 1] = self.vy
+        self.positions[:, 0] = np.array(self.x) + self.velocities[:, 0] * elapsed
+        self.positions[:, 1] = np.array(self.y) + self.velocities[:, 1] * elapsed
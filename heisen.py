@@ -1,14 +1,35 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-
-class HeisenbergUncertaintyApp:
-    def __init__(self, root):
-        # Initialize the Heisenberg Uncertainty App with a root window.
+from simwindow import FigureWindow
+from wavepacket import SplitStepWavepacket
+
+# Histogram bins in units of the standard deviation. A sample z * dx falls in
+# bin i of the edges EDGES * dx exactly when z falls in bin i of EDGES, so the
+# counts of the standard samples serve every Δx and Δp unchanged.
+BINS = 50
+EDGES = np.linspace(-4.5, 4.5, BINS + 1)
+
+# Display modes. "Static" shows the sampled histograms; the others evolve a
+# wavepacket in the given potential, starting at the given position with
+# the given mean momentum.
+MODES = {
+    "Static": None,
+    "Free particle": ("free", 0.0, 0.0),
+    "Harmonic": ("harmonic", 0.0, 0.0),
+    "Barrier": ("barrier", -5.0, 2.0),
+}
+VIEW = 10  # The plot shows x and p between -VIEW and VIEW.
+STEPS_PER_TICK = 2  # Wavepacket steps of dt = 0.01 per 20 ms tick.
+
+class HeisenbergUncertaintyApp(FigureWindow):
+    def __init__(self, root, seed=0):
+        # Initialize the Heisenberg Uncertainty App with a root window. The
+        # seed fixes the samples, so the histograms are the same every run.
+        super().__init__(root)
         self.root = root
         self.root.title("Heisenberg Uncertainty Principle Visualization")
+        self.seed = seed
 
         # Create a frame to hold the widgets.
         self.frame = ttk.Frame(root)
@@ -24,80 +45,170 @@ class HeisenbergUncertaintyApp:
         
         # Create a slider to control the uncertainty in position.
         self.dx_var = tk.DoubleVar(value=1.0)
-        self.dx_scale = ttk.Scale(self.frame, variable=self.dx_var, from_=0.1, to_=5.0, orient='horizontal', command=self.update_plot)
+        self.dx_scale = ttk.Scale(self.frame, variable=self.dx_var, from_=0.1, to_=5.0, orient='horizontal', command=self.change_dx)
         self.dx_scale.grid(row=0, column=1, padx=5, pady=5)
 
         # Create a button to reset the sliders.
         self.reset_button = ttk.Button(self.frame, text="Reset", command=self.reset_sliders)
         self.reset_button.grid(row=0, column=2, padx=5, pady=5)
 
-        # Create a figure and axis for plotting.
-        self.fig, self.ax = plt.subplots(figsize=(10, 6))
-        # Create a canvas to display the plot within the frame.
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().grid(row=1, column=0, columnspan=3)
-
-        # Set plotting to True and update the plot.
+        # Create a selector for the number of samples in each histogram.
+        ttk.Label(self.frame, text="Samples:").grid(row=0, column=3, padx=5, pady=5, sticky='e')
+        self.samples_var = tk.StringVar(value="1000")
+        samples_box = ttk.Combobox(self.frame, textvariable=self.samples_var, width=10,
+                                   values=[str(10 ** n) for n in range(3, 8)])
+        samples_box.grid(row=0, column=4, padx=5, pady=5)
+        samples_box.bind("<<ComboboxSelected>>", self.resample)
+        samples_box.bind("<Return>", self.resample)
+
+        # Create a selector for static histograms or an evolving wavepacket.
+        ttk.Label(self.frame, text="Mode:").grid(row=0, column=5, padx=5, pady=5, sticky='e')
+        self.mode_var = tk.StringVar(value="Static")
+        mode_box = ttk.Combobox(self.frame, textvariable=self.mode_var, values=list(MODES), state="readonly", width=12)
+        mode_box.grid(row=0, column=6, padx=5, pady=5)
+        mode_box.bind("<<ComboboxSelected>>", self.change_mode)
+
+        # Create a figure and axis for plotting, with a canvas to display it
+        # within the frame.
+        self.ax = self.create_figure(self.frame, figsize=(10, 6))
+        self.canvas.get_tk_widget().grid(row=1, column=0, columnspan=7)
+
+        # Set plotting to True.
         self.plotting = True
-        self.update_plot()
 
     def create_plot(self):
-        self.update_plot()
-        self.root.after(100, self.update_plot)
-
-    def update_plot(self, event=None):
-        if self.plotting:
+        # Create the histogram bars, curves and readout once; render() only
+        # rescales them. They are all animated, so a redraw blits just them.
+        self.x = np.linspace(-10, 10, 100)
+        self.p = np.linspace(-10, 10, 100)
+        zeros = np.zeros(BINS)
+        self.pos_bars = self.ax.bar(EDGES[:-1], zeros, width=np.diff(EDGES), align='edge', alpha=0.6, color='blue', label='Position')
+        self.pos_line = self.animate(self.ax.plot(self.x, np.zeros_like(self.x), color='blue', linestyle='--')[0])
+        self.mom_bars = self.ax.bar(EDGES[:-1], zeros, width=np.diff(EDGES), align='edge', alpha=0.6, color='red', label='Momentum')
+        self.mom_line = self.animate(self.ax.plot(self.p, np.zeros_like(self.p), color='red', linestyle='--')[0])
+        for bar in list(self.pos_bars) + list(self.mom_bars):
+            self.animate(bar)
+
+        # Adding text annotations
+        self.readout = self.animate(self.ax.text(0.95, 0.95, "", verticalalignment='top', horizontalalignment='right', transform=self.ax.transAxes,
+                                                 color='black', fontsize=12, bbox=dict(facecolor='white', alpha=0.8, edgecolor='black')))
+
+        # Move the legend to the upper left corner to avoid overlap
+        self.ax.legend(loc='upper left')
+
+        self.ax.set_title("Heisenberg Uncertainty Principle")
+        self.ax.set_xlabel("Value")
+        self.ax.set_ylabel("Probability Density")
+        self.ax.grid(True)
+
+        # Set fixed axes limits
+        self.ax.set_xlim(-VIEW, VIEW)
+        self.ax.set_ylim(0, 1.2)
+
+        # The barrier is shaded while the barrier mode runs.
+        self.barrier = self.ax.axvspan(2, 3, color='grey', alpha=0.3, visible=False)
+
+        # Wavepacket modes run as an animation; the static mode only redraws
+        # on request.
+        self.wavepacket = None
+
+        self.resample()
+
+    def resample(self, event=None):
+        # Draw standard normal samples for position and momentum and count
+        # them into the standard bins. This only happens when the sample count
+        # changes; the slider just rescales the counts.
+        try:
+            samples = int(float(self.samples_var.get()))
+        except ValueError:
+            samples = 1000
+        samples = min(max(samples, 1), 10 ** 7)
+        self.samples_var.set(str(samples))
+
+        rng = np.random.default_rng(self.seed)
+        bin_width = EDGES[1] - EDGES[0]
+        # Standard-normal density in each bin, before dividing by Δx or Δp.
+        self.pos_density = np.histogram(rng.standard_normal(samples), bins=EDGES)[0] / (samples * bin_width)
+        self.mom_density = np.histogram(rng.standard_normal(samples), bins=EDGES)[0] / (samples * bin_width)
+        self.request_update()
+
+    def change_mode(self, event=None):
+        self.stop_animation()
+        mode = MODES[self.mode_var.get()]
+        static = mode is None
+        for bar in list(self.pos_bars) + list(self.mom_bars):
+            bar.set_visible(static)
+        self.barrier.set_visible(not static and mode[0] == "barrier")
+        self.invalidate()
+        if static:
+            self.wavepacket = None
+            self.request_update()
+            return
+
+        potential, x0, p0 = mode
+        self.wavepacket = SplitStepWavepacket(self.dx_var.get(), potential, dt=0.01, x0=x0, p0=p0)
+        # Only the part of the grid inside the view is drawn, thinned to
+        # about a thousand points.
+        x = self.wavepacket.x
+        self.x_view = np.flatnonzero(np.abs(x) <= VIEW)[::max(1, int(np.sum(np.abs(x) <= VIEW)) // 1000)]
+        p = np.fft.fftshift(self.wavepacket.k)
+        self.p_view = np.flatnonzero(np.abs(p) <= VIEW)
+        self.p_view = self.p_view[::max(1, len(self.p_view) // 1000)]
+        self.start_animation(timestep=0.02)
+
+    def change_dx(self, event=None):
+        # A new Δx restarts the wavepacket from a fresh Gaussian; the running
+        # animation draws it on its next frame.
+        if self.wavepacket is not None:
+            self.wavepacket.reset(self.dx_var.get())
+        else:
+            self.request_update()
+
+    def update_state(self):
+        if self.animating:
+            self.wavepacket.step(STEPS_PER_TICK)
+
+    def render(self):
+        if self.plotting and self.wavepacket is not None:
+            # Plot |psi(x)|^2 and |phi(p)|^2 of the evolving wavepacket.
+            packet = self.wavepacket
+            momentum_density = packet.momentum_density()
+            self.pos_line.set_data(packet.x[self.x_view], packet.position_density()[self.x_view])
+            self.mom_line.set_data(np.fft.fftshift(packet.k)[self.p_view], np.fft.fftshift(momentum_density)[self.p_view])
+            dx, dp = packet.spreads(momentum_density)
+            self.readout.set_text(f"t = {packet.time:.2f}\nΔx(t) = {dx:.2f}\nΔp(t) = {dp:.2f}\nΔx * Δp = {dx * dp:.3f}")
+        elif self.plotting:
             dx = self.dx_var.get()
             hbar = 1.0  # Reduced Planck constant in normalized units
             dp = hbar / (2 * dx)  # Uncertainty in momentum due to the uncertainty principle
 
-            # Clear the previous plot
-            self.ax.clear()
-
-            # Generate data for position and momentum uncertainties
-            x = np.linspace(-10, 10, 100)
-            p = np.linspace(-10, 10, 100)
-
             # Gaussian distribution in position space
-            pos_distribution = (1 / (dx * np.sqrt(2 * np.pi))) * np.exp(-0.5 * (x / dx) ** 2)
-            pos_particles = np.random.normal(0, dx, 1000)
+            self.pos_line.set_data(self.x, (1 / (dx * np.sqrt(2 * np.pi))) * np.exp(-0.5 * (self.x / dx) ** 2))
+            self.scale_bars(self.pos_bars, self.pos_density, dx)
 
             # Gaussian distribution in momentum space
-            mom_distribution = (1 / (dp * np.sqrt(2 * np.pi))) * np.exp(-0.5 * (p / dp) ** 2)
-            mom_particles = np.random.normal(0, dp, 1000)
-
-            # Plotting position uncertainty
-            self.ax.hist(pos_particles, bins=50, density=True, alpha=0.6, color='blue', label='Position')
-            self.ax.plot(x, pos_distribution, color='blue', linestyle='--')
-
-            # Plotting momentum uncertainty
-            self.ax.hist(mom_particles, bins=50, density=True, alpha=0.6, color='red', label='Momentum')
-            self.ax.plot(p, mom_distribution, color='red', linestyle='--')
-
-            # Adding text annotations
-            self.ax.text(0.95, 0.95, f"Δx = {dx:.2f}\nΔp = {dp:.2f}\nΔx * Δp = {dx * dp:.2f}",
-                         verticalalignment='top', horizontalalignment='right', transform=self.ax.transAxes,
-                         color='black', fontsize=12, bbox=dict(facecolor='white', alpha=0.8, edgecolor='black'))
-
-            # Move the legend to the upper left corner to avoid overlap
-            self.ax.legend(loc='upper left')
+            self.mom_line.set_data(self.p, (1 / (dp * np.sqrt(2 * np.pi))) * np.exp(-0.5 * (self.p / dp) ** 2))
+            self.scale_bars(self.mom_bars, self.mom_density, dp)
 
-            self.ax.set_title("Heisenberg Uncertainty Principle")
-            self.ax.set_xlabel("Value")
-            self.ax.set_ylabel("Probability Density")
-            self.ax.grid(True)
+            self.readout.set_text(f"Δx = {dx:.2f}\nΔp = {dp:.2f}\nΔx * Δp = {dx * dp:.2f}")
 
-            # Set fixed axes limits
-            self.ax.set_xlim(-10, 10)
-            self.ax.set_ylim(0, 1.2)
+        # Redraw the canvas
+        super().render()
 
-            # Redraw the canvas
-            self.canvas.draw()
+    def scale_bars(self, bars, density, width):
+        # Stretch the standard histogram to a spread of width: the edges scale
+        # by width and the density by 1 / width.
+        left = EDGES[:-1] * width
+        bar_width = (EDGES[1] - EDGES[0]) * width
+        heights = density / width
+        for bar, x, height in zip(bars, left, heights):
+            bar.set_x(x)
+            bar.set_width(bar_width)
+            bar.set_height(height)
 
     def reset_sliders(self):
         self.dx_var.set(1.0)
-        self.update_plot()
+        self.change_dx()
 
     def start_plotting(self):
         self.plotting = True
@@ -1,34 +1,53 @@
 import tkinter as tk
-from tkinter import ttk
-import random
+from tkinter import ttk, filedialog, messagebox
 import math
+import numpy as np
+from gasengine import IdealGasEngine, SpeedHistogram, berendsen_factor, maxwell_boltzmann_density
+from hardsphere import HardSphereEngine
+from lennardjones import LennardJonesEngine
+from renderer import ParticleRenderer
+from simwindow import SimulationWindow
+from trajectory import TrajectoryWriter, TrajectoryReader, TrajectoryPlayer
 
-class IdealGasSimulationApp:
+# Particle engines selectable in the window. All share the same constructor
+# arguments and expose step() and positions.
+ENGINES = {
+    "Ideal gas": IdealGasEngine,
+    "Hard spheres": HardSphereEngine,
+    "Lennard-Jones": LennardJonesEngine,
+}
+
+# Range of the volume slider, in m^3.
+VOLUME_RANGE = (0.001, 50)
+
+class IdealGasSimulationApp(SimulationWindow):
     def __init__(self, master):
-        self.master = master
+        super().__init__(master)
         self.master.title("Ideal Gas Simulation")
 
-        # Style
+        # Style. The window runs in whatever ttk theme the process uses (the
+        # menu and the standalone script both pick "clam"); it only configures
+        # its own Gas.* styles, so other windows sharing the Tk interpreter
+        # keep their look.
         self.style = ttk.Style()
-        self.style.theme_use("clam")
         
         # Button style
-        self.style.configure("TButton", 
+        self.style.configure("Gas.TButton", 
                              foreground="white", 
                              background="darkgreen", 
                              font=("Arial", 12, "bold"),
                              padding=6)
-        self.style.map("TButton", 
+        self.style.map("Gas.TButton", 
                        background=[("active", "forestgreen"), ("disabled", "gray")])
         
         # Label style
-        self.style.configure("TLabel", 
+        self.style.configure("Gas.TLabel", 
                              foreground="black", 
                              background="#f0f0f0", 
                              font=("Arial", 12, "bold"))
         
         # Scale style
-        self.style.configure("TScale",
+        self.style.configure("Gas.Horizontal.TScale",
                              troughcolor="darkgray", 
                              background="lightgray", 
                              foreground="black", 
@@ -37,7 +56,7 @@ class IdealGasSimulationApp:
         
         # Frame background color
         self.master.configure(background="#f8f8f8")
-        
+
         # Parameters
         self.temperature = tk.DoubleVar()
         self.pressure = tk.DoubleVar()
@@ -47,38 +66,68 @@ class IdealGasSimulationApp:
         self.temperature.set(300)  # Kelvin
         self.pressure.set(101325)  # Pascals
         self.volume.set(0.01)      # m^3
+
+        # Slider changes are picked up by the running simulation at its next step
+        self.parameters_changed = False
+        for variable in (self.temperature, self.pressure, self.volume):
+            variable.trace_add("write", self.on_parameter_change)
+        self.mode = tk.StringVar(value="Ideal gas")
+        self.record = tk.BooleanVar(value=False)
+        self.recorder = None
+        self.player = None
         
         # Canvas
         self.canvas = tk.Canvas(master, width=350, height=350, bg="#e0e0e0", borderwidth=0, relief="flat")
         self.canvas.grid(row=0, column=0, columnspan=2, padx=10, pady=10)
+
+        # Speed distribution panel
+        self.histogram_canvas = tk.Canvas(master, width=250, height=350, bg="#f0f0f0", borderwidth=0, relief="flat")
+        self.histogram_canvas.grid(row=0, column=2, padx=10, pady=10)
         
         # Labels and sliders
         self.create_label_and_scale(master, "Temperature (K):", self.temperature, 100, 1500, 10).grid(row=1, column=0, columnspan=2, padx=5, pady=5)
         self.create_label_and_scale(master, "Pressure (Pa):", self.pressure, 10000, 200000, 1000).grid(row=2, column=0, columnspan=2, padx=5, pady=5)
-        self.create_label_and_scale(master, "Volume (m^3):", self.volume, 0.001, 50, 0.001).grid(row=3, column=0, columnspan=2, padx=5, pady=5)
+        volume_frame = self.create_label_and_scale(master, "Volume (m^3):", self.volume, VOLUME_RANGE[0], VOLUME_RANGE[1], 0.001)
+        volume_frame.grid(row=3, column=0, columnspan=2, padx=5, pady=5)
+        # A recording stores one box size, so the volume is locked while recording
+        self.volume_scale = volume_frame.scale
         
         # Start and stop buttons
-        self.start_button = ttk.Button(master, text="Start Simulation", command=self.start_simulation)
+        self.start_button = ttk.Button(master, text="Start Simulation", command=self.start_simulation, style="Gas.TButton")
         self.start_button.grid(row=4, column=0, columnspan=2, pady=10)
-        self.stop_button = ttk.Button(master, text="Stop Simulation", command=self.stop_simulation, state=tk.DISABLED)
+        self.stop_button = ttk.Button(master, text="Stop Simulation", command=self.stop_simulation, state=tk.DISABLED, style="Gas.TButton")
         self.stop_button.grid(row=5, column=0, columnspan=2, pady=5)
 
+        # Simulation mode: free particles, colliding hard spheres or a real gas
+        mode_frame = ttk.Frame(master)
+        for name in ENGINES:
+            ttk.Radiobutton(mode_frame, text=name, variable=self.mode, value=name).pack(side=tk.LEFT, padx=5)
+        mode_frame.grid(row=6, column=0, columnspan=2, pady=5)
+
+        # Recording and replay of runs
+        record_frame = ttk.Frame(master)
+        ttk.Checkbutton(record_frame, text="Record to file", variable=self.record).pack(side=tk.LEFT, padx=5)
+        self.replay_button = ttk.Button(record_frame, text="Replay Recording", command=self.replay_recording, style="Gas.TButton")
+        self.replay_button.pack(side=tk.LEFT, padx=5)
+        record_frame.grid(row=7, column=0, columnspan=2, pady=5)
+
     def create_label_and_scale(self, master, text, variable, min_val, max_val, resolution):
         frame = ttk.Frame(master)
         
-        label = ttk.Label(frame, text=text)
+        label = ttk.Label(frame, text=text, style="Gas.TLabel")
         label.pack(side=tk.TOP, anchor=tk.W)
         
-        value_label = ttk.Label(frame, text=f"{variable.get():.2f}")
+        value_label = ttk.Label(frame, text=f"{variable.get():.2f}", style="Gas.TLabel")
         value_label.pack(side=tk.RIGHT, padx=5)
         
-        scale = ttk.Scale(frame, variable=variable, orient=tk.HORIZONTAL, length=400,
+        scale = ttk.Scale(frame, variable=variable, orient=tk.HORIZONTAL, length=400, style="Gas.Horizontal.TScale",
                           from_=min_val, to=max_val, command=lambda v, var=variable: self.update_value_label(var, value_label))
         scale.pack(side=tk.LEFT, padx=5, pady=5)
         
-        min_max_label = ttk.Label(frame, text=f"Min: {min_val}, Max: {max_val}")
+        min_max_label = ttk.Label(frame, text=f"Min: {min_val}, Max: {max_val}", style="Gas.TLabel")
         min_max_label.pack(side=tk.BOTTOM, anchor=tk.W)
         
+        frame.scale = scale
         return frame
     
     def update_value_label(self, variable, label):
@@ -87,7 +136,7 @@ class IdealGasSimulationApp:
 
 
     def create_float_scale(self, master, variable, from_, to, resolution):
-        scale = ttk.Scale(master, from_=from_, to=to, variable=variable, orient=tk.HORIZONTAL, style="Horizontal.TScale")
+        scale = ttk.Scale(master, from_=from_, to=to, variable=variable, orient=tk.HORIZONTAL, style="Gas.Horizontal.TScale")
         scale.set(variable.get())
         scale.bind("<Motion>", lambda event: self.update_float_scale_label(variable, resolution))
         return scale
@@ -96,12 +145,8 @@ class IdealGasSimulationApp:
         value = round(variable.get() / resolution) * resolution
         variable.set(value)
 
-    def start_simulation(self):
-        self.start_button.config(state=tk.DISABLED)
-        self.stop_button.config(state=tk.NORMAL)
-    
+    def mean_speed(self):
         gas_constant = 8.314  # J/(mol*K)
-        num_particles = 80
     
         # Calculate the mean speed of the particles
         # The formula is sqrt((3 * R * T) / (V * P * constant_factor))
@@ -110,45 +155,174 @@ class IdealGasSimulationApp:
         pressure = self.pressure.get()
         constant_factor = 0.1  # Adjust this factor to match your desired behavior
     
-        speed = math.sqrt((3 * gas_constant * temperature) / (volume * pressure * constant_factor))
+        return math.sqrt((3 * gas_constant * temperature) / (volume * pressure * constant_factor))
+
+    def box_size(self, num_particles, radius):
+        # The volume slider spans more than four decades, far more than the
+        # canvas can show in proportion, so its range maps logarithmically
+        # onto box sides from the smallest box the particles fit in up to the
+        # whole canvas. Every slider position moves the walls.
+        smallest = 2.5 * radius * math.sqrt(num_particles)
+        low, high = VOLUME_RANGE
+        volume = min(max(self.volume.get(), low), high)
+        fraction = math.log(volume / low) / math.log(high / low)
+        return smallest * (350 / smallest) ** fraction
+
+    def start_simulation(self):
+        self.start_button.config(state=tk.DISABLED)
+        self.replay_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
     
-        self.particles = []
-        for _ in range(num_particles):
-            x = random.randint(50, 450)
-            y = random.randint(50, 450)
-            vx = random.uniform(-speed, speed)
-            vy = random.uniform(-speed, speed)
-            particle = self.canvas.create_oval(x-3, y-3, x+3, y+3, fill="red", outline="black", width=1, tags="particle")
-            self.particles.append([particle, vx, vy])
+        num_particles = 80
+        speed = self.mean_speed()
+        self.target_speed = speed
+        self.parameters_changed = False
     
-        self.move_particles()
+        # Particle state lives in the engine; the canvas shows it as one image
+        size = self.box_size(num_particles, 3)
+        self.engine = ENGINES[self.mode.get()](num_particles, size, size, speed, radius=3)
+        if self.record.get():
+            path = filedialog.asksaveasfilename(defaultextension=".gastraj", filetypes=[("Gas trajectories", "*.gastraj")])
+            if path:
+                self.recorder = TrajectoryWriter(path, num_particles, width=size, height=size)
+                self.volume_scale.state(["disabled"])
+        self.show_particles()
+
+    def replay_recording(self):
+        # Play a recorded run back; the player stands in for the engine
+        path = filedialog.askopenfilename(filetypes=[("Gas trajectories", "*.gastraj")])
+        if not path:
+            return
+        try:
+            self.player = TrajectoryPlayer(TrajectoryReader(path))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to open recording: {e}")
+            return
+        self.start_button.config(state=tk.DISABLED)
+        self.replay_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.engine = self.player
+        self.show_particles()
+
+    def show_particles(self):
+        self.renderer = ParticleRenderer(350, 350, radius=3)
+        self.image = tk.PhotoImage(width=350, height=350)
+        self.image_item = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.image, tags="particle")
+        self.box_item = self.canvas.create_rectangle(0, 0, self.engine.width, self.engine.height, outline="black", tags="particle")
+        self.create_histogram()
+
+        # Physics runs in fixed 20 ms steps; frames are drawn as time allows
+        self.start_animation(timestep=0.02)
 
+    def create_histogram(self):
+        # Fixed bins up to four thermal speeds, where the Maxwell-Boltzmann
+        # tail holds well under 0.1% of the particles. The hotter of the
+        # current and the thermostat's target temperature sets them, so they
+        # also cover a gas being heated towards a new target.
+        velocities = self.engine.velocities
+        temperature = float(np.einsum("ij,ij->", velocities, velocities)) / (2 * max(len(velocities), 1))
+        if self.player is None:
+            temperature = max(temperature, self.target_speed ** 2 / 3)
+        self.histogram = SpeedHistogram(30, 4 * math.sqrt(max(temperature, 1e-9)), window=50)
+        self.histogram_canvas.delete("all")
+        self.histogram_canvas.create_text(125, 15, text="Speed distribution", font=("Arial", 10, "bold"))
+        self.histogram_bars = [self.histogram_canvas.create_rectangle(0, 0, 0, 0, fill="red", outline="") for _ in range(self.histogram.bins)]
+        self.histogram_curve = self.histogram_canvas.create_line(0, 0, 0, 0, fill="black", width=2)
 
+    def draw_histogram(self):
+        # Bars show the measured distribution over the last 50 frames, the line
+        # the Maxwell-Boltzmann distribution at the current temperature
+        velocities = self.engine.velocities
+        self.histogram.update(velocities)
+        density = self.histogram.density()
+        temperature = float(np.einsum("ij,ij->", velocities, velocities)) / (2 * max(len(velocities), 1))
+        speeds = np.linspace(0, self.histogram.max_speed, 60)
+        expected = maxwell_boltzmann_density(speeds, max(temperature, 1e-9))
 
+        left, bottom, width, height = 10, 340, 230, 300
+        y_scale = height / max(density.max(), expected.max(), 1e-12)
+        bar_width = width / self.histogram.bins
+        for k, (bar, value) in enumerate(zip(self.histogram_bars, density.tolist())):
+            x = left + k * bar_width
+            self.histogram_canvas.coords(bar, x, bottom - value * y_scale, x + bar_width - 1, bottom)
+        x = left + speeds * (width / self.histogram.max_speed)
+        y = bottom - expected * y_scale
+        self.histogram_canvas.coords(self.histogram_curve, *np.column_stack([x, y]).ravel().tolist())
 
-    def move_particles(self):
-        for particle_info in self.particles:
-            particle, vx, vy = particle_info
-            self.canvas.move(particle, vx, vy)
-            pos = self.canvas.coords(particle)
-            if pos[0] <= 0 or pos[2] >= 350:
-                vx = -vx
-            if pos[1] <= 0 or pos[3] >= 350:
-                vy = -vy
-            particle_info[1] = vx
-            particle_info[2] = vy
-        self.canvas.update()
-        self.master.after(20, self.move_particles)  # Update every 20 milliseconds
+
+
+
+    def on_parameter_change(self, *args):
+        self.parameters_changed = True
+
+    def apply_parameters(self):
+        # Apply slider changes to the running state: the thermostat target
+        # follows the new speed and the walls move with the volume.
+        self.parameters_changed = False
+        try:
+            target_speed = self.mean_speed()
+        except (ValueError, ZeroDivisionError, tk.TclError):
+            return
+        if target_speed != self.target_speed:
+            # New bins for the new temperature, so the tail is not cut off.
+            self.target_speed = target_speed
+            self.create_histogram()
+        size = self.box_size(self.engine.num_particles, self.engine.radius)
+        if size != self.engine.width and self.recorder is None:
+            self.engine.resize(size, size)
+            self.canvas.coords(self.box_item, 0, 0, size, size)
+
+    def update_state(self):
+        # Advance the physics by one fixed step, or the replay by one frame
+        if self.player is not None:
+            self.player.step()
+            return
+        if self.parameters_changed:
+            self.apply_parameters()
+        self.thermostat()
+        self.engine.step()
+        if self.recorder is not None:
+            self.recorder.append(self.engine.positions, self.engine.velocities)
+
+    def thermostat(self):
+        # Berendsen thermostat with a 10 step time constant. The engines start
+        # at temperature speed^2 / 3, a mean square speed of 2/3 speed^2, which
+        # is the target. It stops acting once within 0.1% of the target.
+        velocities = self.engine.velocities
+        mean_square = float(np.einsum("ij,ij->", velocities, velocities)) / max(len(velocities), 1)
+        target = 2 / 3 * self.target_speed ** 2
+        if mean_square > 0 and abs(mean_square / target - 1) > 1e-3:
+            factor = berendsen_factor(mean_square, target, 1.0, 10.0)
+            if factor > 0:
+                self.engine.scale_velocities(factor)
+
+    def render(self):
+        # One image upload per frame, however many particles there are
+        self.image.configure(data=self.renderer.render(self.engine.positions), format="PPM")
+        self.draw_histogram()
 
     def stop_simulation(self):
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
-        for particle_info in self.particles:
-            particle, _, _ = particle_info
-            self.canvas.delete(particle)
-        self.particles = []
+        self.replay_button.config(state=tk.NORMAL)
+        self.stop_animation()
+        self.canvas.delete("particle")
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+            self.volume_scale.state(["!disabled"])
+        self.player = None
+
+    def on_destroy(self, event):
+        # Closing the window while recording finishes the file, so its header
+        # counts every frame written.
+        super().on_destroy(event)
+        if event.widget is self.master and self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
 
 if __name__ == "__main__":
     root = tk.Tk()
+    ttk.Style(root).theme_use("clam")
     app = IdealGasSimulationApp(root)
     root.mainloop()
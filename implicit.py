@@ -0,0 +1,159 @@
+import numpy as np
+
+
+def polynomial_roots(c3, c2, c1, c0):
+    # Real roots of c3*x^3 + c2*x^2 + c1*x + c0 = 0 for whole arrays of
+    # coefficients at once. Returns an array of shape (3, ...) with NaN in place
+    # of roots that are complex or do not exist (quadratic and linear rows).
+    c3, c2, c1, c0 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (c3, c2, c1, c0)))
+    roots = np.full((3,) + c3.shape, np.nan)
+
+    with np.errstate(all="ignore"):
+        # Cubic rows: reduce to the depressed cubic t^3 + p*t + q = 0 with x = t - a/3.
+        cubic = c3 != 0
+        a, b, c = c2 / c3, c1 / c3, c0 / c3
+        p = b - a * a / 3
+        q = 2 * a ** 3 / 27 - a * b / 3 + c
+        disc = (q / 2) ** 2 + (p / 3) ** 3
+        shift = -a / 3
+
+        # One real root (Cardano).
+        one = cubic & (disc > 0)
+        sqrt_disc = np.sqrt(np.where(one, disc, 0))
+        t = np.cbrt(-q / 2 + sqrt_disc) + np.cbrt(-q / 2 - sqrt_disc)
+        roots[0] = np.where(one, t + shift, roots[0])
+
+        # Three real roots (trigonometric form).
+        three = cubic & (disc <= 0)
+        r = 2 * np.sqrt(np.where(three, -p / 3, 0))
+        cos_arg = np.clip(np.where(three & (p != 0), 3 * q / (p * r + (r == 0)), 0), -1, 1)
+        phi = np.arccos(cos_arg) / 3
+        for k in range(3):
+            roots[k] = np.where(three, r * np.cos(phi - 2 * np.pi * k / 3) + shift, roots[k])
+
+        # Quadratic rows.
+        quadratic = ~cubic & (c2 != 0)
+        qdisc = c1 * c1 - 4 * c2 * c0
+        real = quadratic & (qdisc >= 0)
+        sqrt_qdisc = np.sqrt(np.where(real, qdisc, 0))
+        roots[0] = np.where(real, (-c1 + sqrt_qdisc) / (2 * c2), roots[0])
+        roots[1] = np.where(real, (-c1 - sqrt_qdisc) / (2 * c2), roots[1])
+
+        # Linear rows.
+        linear = ~cubic & (c2 == 0) & (c1 != 0)
+        roots[0] = np.where(linear, -c0 / c1, roots[0])
+
+        # Polish every root with a couple of Newton steps to recover the
+        # precision lost in the closed forms when coefficients span many
+        # orders of magnitude.
+        for _ in range(2):
+            value = ((c3 * roots + c2) * roots + c1) * roots + c0
+            slope = (3 * c3 * roots + 2 * c2) * roots + c1
+            step = np.where(slope != 0, value / slope, 0)
+            roots = np.where(np.isfinite(step), roots - step, roots)
+
+    return roots
+
+
+def solve_bracketed(residual, lo, hi, derivative=None, tol=1e-12, maxiter=100):
+    # Find a root of residual(x) between lo and hi for every element at once.
+    # Each element takes a Newton step when a derivative is given (a false
+    # position step otherwise) and falls back to bisection whenever the step
+    # would leave its bracket. Returns the roots and a per-element convergence
+    # mask; elements whose bracket holds no sign change are NaN and unconverged.
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float), np.asarray(hi, dtype=float))
+    lo, hi = lo.copy(), hi.copy()
+
+    with np.errstate(all="ignore"):
+        f_lo, f_hi = residual(lo), residual(hi)
+        bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi))
+        converged = bracketed & ((f_lo == 0) | (f_hi == 0))
+        x = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, (lo + hi) / 2))
+        active = bracketed & ~converged
+
+        for _ in range(maxiter):
+            if not active.any():
+                break
+            f_x = residual(x)
+            converged |= active & (f_x == 0)
+
+            # Shrink each bracket to keep the sign change.
+            left = np.sign(f_x) == np.sign(f_lo)
+            lo = np.where(active & left, x, lo)
+            f_lo = np.where(active & left, f_x, f_lo)
+            hi = np.where(active & ~left, x, hi)
+            f_hi = np.where(active & ~left, f_x, f_hi)
+
+            if derivative is not None:
+                step = x - f_x / derivative(x)
+            else:
+                step = lo - f_lo * (hi - lo) / (f_hi - f_lo)
+            inside = np.isfinite(step) & (step > lo) & (step < hi)
+            new_x = np.where(inside, step, (lo + hi) / 2)
+
+            converged |= active & ((np.abs(new_x - x) <= tol * (1 + np.abs(x))) | (hi - lo <= tol * (1 + np.abs(x))))
+            x = np.where(active, new_x, x)
+            active &= ~converged
+
+    return np.where(bracketed, x, np.nan), converged
+
+
+def _vdw_residual(P, V, n, a, b, R, T):
+    # Van der Waals residual scaled by P*V + n*R*T so it is dimensionless and
+    # stays finite at the n = 0 end of the bracket.
+    return ((P + a * n ** 2 / V ** 2) * (V - n * b) - n * R * T) / (P * V + n * R * T)
+
+
+def _vdw_converged(P, V, n, a, b, R, T, rtol=1e-8):
+    with np.errstate(all="ignore"):
+        return np.isfinite(V) & np.isfinite(n) & (np.abs(_vdw_residual(P, V, n, a, b, R, T)) <= rtol)
+
+
+def vdw_volume(v):
+    # Solve the Van der Waals equation for V. Clearing the fraction gives the
+    # cubic P*V^3 - n*(P*b + R*T)*V^2 + a*n^2*V - a*b*n^3 = 0; the largest real
+    # root above the excluded volume n*b is the gas-phase volume. Rows the
+    # closed form cannot resolve fall back to a bracketed iteration on
+    # [n*b, n*b + n*R*T/P], which always holds a sign change for P > 0.
+    P, n, a, b, R, T = np.broadcast_arrays(*(np.asarray(v[k], dtype=float) for k in ("P", "n", "a", "b", "R", "T")))
+    with np.errstate(all="ignore"):
+        roots = polynomial_roots(P, -n * (P * b + R * T), a * n ** 2, -a * b * n ** 3)
+        roots = np.where(roots > n * b, roots, np.nan)
+        V = np.array(np.fmax.reduce(roots, axis=0))
+
+    retry = ~_vdw_converged(P, V, n, a, b, R, T)
+    if retry.any():
+        rP, rn, ra, rb, rR, rT = (x[retry] for x in (P, n, a, b, R, T))
+        with np.errstate(all="ignore"):
+            upper = rn * rb + rn * rR * rT / rP
+        V[retry], _ = solve_bracketed(lambda x: _vdw_residual(rP, x, rn, ra, rb, rR, rT), rn * rb, upper)
+    return V, _vdw_converged(P, V, n, a, b, R, T)
+
+
+def vdw_moles(v):
+    # Solve the Van der Waals equation for n. Expanding in n gives the cubic
+    # -(a*b/V^2)*n^3 + (a/V)*n^2 - (P*b + R*T)*n + P*V = 0; the smallest
+    # positive root below V/b is the gas-phase amount, matching the branch
+    # vdw_volume picks. The fallback bracket is [0, V/b].
+    P, V, a, b, R, T = np.broadcast_arrays(*(np.asarray(v[k], dtype=float) for k in ("P", "V", "a", "b", "R", "T")))
+    with np.errstate(all="ignore"):
+        roots = polynomial_roots(-a * b / V ** 2, a / V, -(P * b + R * T), P * V)
+        roots = np.where((roots > 0) & ((b == 0) | (roots < V / b)), roots, np.nan)
+        n = np.array(np.fmin.reduce(roots, axis=0))
+
+    retry = ~_vdw_converged(P, V, n, a, b, R, T) & (b > 0)
+    if retry.any():
+        rP, rV, ra, rb, rR, rT = (x[retry] for x in (P, V, a, b, R, T))
+        with np.errstate(all="ignore"):
+            upper = rV / rb
+        n[retry], _ = solve_bracketed(lambda x: _vdw_residual(rP, rV, x, ra, rb, rR, rT), np.zeros_like(rV), upper)
+    return n, _vdw_converged(P, V, n, a, b, R, T)
+
+
+# Solvers for (equation, missing variable) pairs with no closed-form inverse.
+# Each takes a dictionary of known values (scalars or arrays) and returns the
+# solution together with a per-element convergence mask.
+IMPLICIT_SOLVERS = {
+    ("Van der Waals Equation", "V"): vdw_volume,
+    ("Van der Waals Equation", "n"): vdw_moles,
+}
@@ -0,0 +1,176 @@
+import re
+import numpy as np
+
+# Coefficients of RODAS3 (Sandu et al.), a four-stage third-order Rosenbrock
+# method with an embedded second-order error estimate. It is stiffly accurate
+# and L-stable, so it copes with networks whose rate constants span many
+# orders of magnitude.
+GAMMA = 0.5
+STAGE_A = {2: (0.0,), 3: (2.0, 0.0), 4: (2.0, 0.0, 1.0)}
+STAGE_C = {2: (4.0,), 3: (1.0, -1.0), 4: (1.0, -1.0, -8 / 3)}
+NEW_F = {2: False, 3: True, 4: True}
+WEIGHTS = (2.0, 0.0, 1.0, 1.0)
+ERROR_WEIGHTS = (0.0, 0.0, 0.0, 1.0)
+ORDER = 3
+
+_TERM = re.compile(r"^\s*(\d*)\s*([A-Za-z_]\w*)\s*$")
+
+
+def _parse_side(side):
+    # "2A + B" -> {"A": 2, "B": 1}; an empty side has no species.
+    counts = {}
+    for term in side.split("+"):
+        if not term.strip():
+            continue
+        match = _TERM.match(term)
+        if match is None:
+            raise ValueError(f"Cannot read reaction term {term.strip()!r}.")
+        coefficient = int(match.group(1) or 1)
+        counts[match.group(2)] = counts.get(match.group(2), 0) + coefficient
+    return counts
+
+
+class ReactionNetwork:
+    # A network of elementary steps with mass-action kinetics, written as
+    # strings such as "A -> B", "2A -> C", "A + B <=> C" or "-> A". Every step
+    # has its own rate constant and a reversible step has two, forward then
+    # reverse. The order of a step is the number of molecules it consumes, so
+    # "-> A" is zeroth order, "A -> B" first and "2A -> B" or "A + B -> C"
+    # second. Species are numbered in order of first appearance.
+    #
+    # integrate() solves many parameter sets at once: every array carries a
+    # leading batch axis, and the whole batch advances as one vectorized system
+    # in which each member keeps its own adaptive step size.
+    def __init__(self, steps):
+        self.species = []
+        self.labels = []
+        reactions = []
+        for step in steps:
+            if "<=>" in step:
+                left, right = step.split("<=>")
+                reactions += [(left, right), (right, left)]
+            elif "->" in step:
+                reactions.append(tuple(step.split("->")))
+            else:
+                raise ValueError(f"Reaction {step!r} needs '->' or '<=>'.")
+        parsed = [(_parse_side(left), _parse_side(right)) for left, right in reactions]
+        for reactants, products in parsed:
+            for name in list(reactants) + list(products):
+                if name not in self.species:
+                    self.species.append(name)
+
+        # Reactant and net stoichiometry, one row per reaction.
+        self.reactant_matrix = np.zeros((len(parsed), len(self.species)))
+        self.stoichiometry = np.zeros((len(parsed), len(self.species)))
+        for r, (reactants, products) in enumerate(parsed):
+            for name, count in reactants.items():
+                self.reactant_matrix[r, self.species.index(name)] = count
+                self.stoichiometry[r, self.species.index(name)] -= count
+            for name, count in products.items():
+                self.stoichiometry[r, self.species.index(name)] += count
+            self.labels.append(" -> ".join(" + ".join(f"{c if c > 1 else ''}{n}" for n, c in side.items()) for side in (reactants, products)).strip())
+
+        # Reactant orders with the order in species s lowered by one, for the
+        # derivative of every rate by species s; shape (species, reactions, species).
+        lowered = self.reactant_matrix[None, :, :] - np.eye(len(self.species))[:, None, :]
+        self.reduced_orders = np.maximum(lowered, 0)
+
+    @property
+    def num_reactions(self):
+        return len(self.reactant_matrix)
+
+    def rates(self, y, k):
+        # Mass-action rate of every reaction, shape (batch, reactions).
+        return k * np.prod(np.power(y[:, None, :], self.reactant_matrix), axis=2)
+
+    def derivatives(self, y, k):
+        return self.rates(y, k) @ self.stoichiometry
+
+    def jacobian(self, y, k):
+        # d(dy_i/dt)/dy_s for every batch member, shape (batch, species, species).
+        # The rate of reaction r differentiated by species s is
+        # k_r * n_rs * prod(y ** reduced_orders[s, r]).
+        partial = np.prod(np.power(y[:, None, None, :], self.reduced_orders), axis=3)
+        rate_jacobian = k[:, :, None] * self.reactant_matrix * partial.transpose(0, 2, 1)
+        return np.einsum("ri,brs->bis", self.stoichiometry, rate_jacobian)
+
+    def integrate(self, initial, constants, times, rtol=1e-6, atol=1e-9, max_steps=100000):
+        # Concentrations at the given output times (starting from t = 0) for
+        # every parameter set. initial has shape (batch, species) and constants
+        # (batch, reactions); either may also be a single row shared by the
+        # whole batch. Returns an array of shape (batch, times, species).
+        times = np.asarray(times, dtype=float)
+        initial, constants = np.atleast_2d(initial), np.atleast_2d(constants)
+        batch = max(len(initial), len(constants))
+        y = np.array(np.broadcast_to(initial, (batch, len(self.species))), dtype=float)
+        k = np.array(np.broadcast_to(constants, (batch, self.num_reactions)), dtype=float)
+        if np.any(np.diff(times) < 0) or (len(times) and times[0] < 0):
+            raise ValueError("Output times must be non-negative and increasing.")
+
+        out = np.empty((batch, len(times), len(self.species)))
+        start = np.searchsorted(times, 0.0, side="right")
+        out[:, :start] = y[:, None, :]
+        next_out = np.full(batch, start)
+        t = np.zeros(batch)
+        f = self.derivatives(y, k)
+        if start == len(times):
+            return out
+
+        # First step: small enough that no component changes by more than
+        # about 1% of its tolerance scale.
+        scale = atol + rtol * np.abs(y)
+        h = np.minimum(0.01 / np.maximum(np.max(np.abs(f) / scale, axis=1), 1e-300), times[-1])
+        identity = np.eye(len(self.species))
+
+        for _ in range(max_steps):
+            active = next_out < len(times)
+            if not active.any():
+                return out
+            # Steps never run past the next output time, so every output is the
+            # end of an accepted step rather than an interpolated value.
+            target = times[np.minimum(next_out, len(times) - 1)]
+            reaches = target - t <= h
+            h_step = np.where(active, np.where(reaches, target - t, h), 0.0)
+
+            # Each stage solves (I/(gamma*h) - J) K = rhs with the same matrix.
+            safe_h = np.where(h_step > 0, h_step, 1.0)[:, None]
+            solver = GAMMA * safe_h[:, :, None] * np.linalg.inv(identity - (GAMMA * h_step)[:, None, None] * self.jacobian(y, k))
+            stages = []
+            stage_f = f
+            for stage in range(1, 5):
+                if stage > 1 and NEW_F[stage]:
+                    y_stage = y + sum(a * K for a, K in zip(STAGE_A[stage], stages) if a)
+                    stage_f = self.derivatives(y_stage, k)
+                rhs = stage_f + sum(c * K for c, K in zip(STAGE_C.get(stage, ()), stages)) / safe_h
+                stages.append(np.einsum("bij,bj->bi", solver, rhs))
+            y_new = y + sum(w * K for w, K in zip(WEIGHTS, stages) if w)
+            step_error = sum(w * K for w, K in zip(ERROR_WEIGHTS, stages) if w)
+
+            error_scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+            error = np.sqrt(np.mean((step_error / error_scale) ** 2, axis=1))
+            finite = np.isfinite(error) & np.all(np.isfinite(y_new), axis=1)
+            accept = active & finite & (error <= 1)
+
+            y = np.where(accept[:, None], y_new, y)
+            t = np.where(accept, np.where(reaches, target, t + h_step), t)
+            f = np.where(accept[:, None], self.derivatives(y, k), f)
+            done = np.flatnonzero(accept & reaches)
+            out[done, next_out[done]] = y[done]
+            next_out[done] += 1
+            # Repeated output times need no further steps.
+            while True:
+                repeat = done[next_out[done] < len(times)]
+                repeat = repeat[times[next_out[repeat]] <= t[repeat]]
+                if not len(repeat):
+                    break
+                out[repeat, next_out[repeat]] = y[repeat]
+                next_out[repeat] += 1
+
+            with np.errstate(divide="ignore"):
+                factor = np.where(finite, np.clip(0.9 * error ** (-1 / ORDER), 0.2, 5.0), 0.2)
+            # A step cut short by an output time keeps the longer step proposed
+            # for the next one.
+            proposed = np.maximum(h_step, 1e-300) * factor
+            h = np.where(active, np.where(accept & reaches, np.maximum(proposed, h), proposed), h)
+
+        raise RuntimeError(f"Integration did not finish within {max_steps} steps.")
@@ -0,0 +1,189 @@
+import math
+import numpy as np
+from gasengine import maxwell_boltzmann, rescale_positions
+
+# Half of the 3x3 block of neighbouring cells, so each pair of cells is visited once.
+HALF_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class LennardJonesEngine:
+    # Soft-sphere "real gas": particles of unit mass interact through the
+    # Lennard-Jones potential 4*epsilon*((sigma/r)^12 - (sigma/r)^6), cut off
+    # at cutoff*sigma, and bounce off the walls of the box. sigma is chosen so
+    # the bottom of the potential well sits at one drawn diameter. The attractive
+    # tail is what makes the gas depart from PV = nRT, as in the Van der Waals
+    # equation; epsilon is in the same units as the kinetic energy per particle,
+    # which is about 25 at the default slider settings.
+    #
+    # Motion is integrated with velocity Verlet in substeps sized to the
+    # fastest particle. Forces come from a Verlet neighbour list of all pairs
+    # closer than the cutoff plus a skin distance, built with a linked-cell
+    # grid. The list is only rebuilt once some particle has moved more than half
+    # the skin since the last build, so both the build and the force evaluation
+    # are O(N).
+    def __init__(self, num_particles, width, height, speed, radius=3.0, seed=None,
+                 epsilon=25.0, cutoff=2.5, skin=0.3, timestep=None):
+        self.width = float(width)
+        self.height = float(height)
+        self.radius = float(radius)
+        self.rng = np.random.default_rng(seed)
+
+        self.epsilon = float(epsilon)
+        self.sigma = 2 * self.radius / 2 ** (1 / 6)
+        self.cutoff = cutoff * self.sigma
+        self.skin = skin * self.sigma
+        # Substeps are at most timestep long, and short enough that the fastest
+        # particle moves no more than a fiftieth of sigma in one.
+        self.timestep = timestep if timestep is not None else math.inf
+        core = 0.8 * self.sigma
+        self.core_scale = 24 * self.epsilon * (2 * (self.sigma / core) ** 12 - (self.sigma / core) ** 6) / core ** 2
+
+        self.lower = np.array([self.radius, self.radius])
+        self.upper = np.array([self.width - self.radius, self.height - self.radius])
+
+        self.positions = self.place_particles(num_particles)
+        self.velocities = maxwell_boltzmann(self.rng, num_particles, speed)
+        self.time = 0.0
+        self.rebuilds = 0
+
+        self.build_neighbours()
+        self.forces = self.compute_forces()
+
+    @property
+    def num_particles(self):
+        return len(self.positions)
+
+    def place_particles(self, num_particles):
+        # Random sites on a lattice at the potential minimum, so the run does not
+        # start with huge repulsive forces between overlapping particles.
+        spacing = 2 * self.radius
+        nx = int((self.width - 2 * self.radius) // spacing) + 1
+        ny = int((self.height - 2 * self.radius) // spacing) + 1
+        if num_particles > nx * ny:
+            raise ValueError(f"{num_particles} particles of radius {self.radius} do not fit in the box.")
+        sites = self.rng.choice(nx * ny, size=num_particles, replace=False)
+        return np.column_stack([self.radius + (sites // ny) * spacing, self.radius + (sites % ny) * spacing])
+
+    def build_neighbours(self):
+        # Collect every pair closer than cutoff + skin. Particles are sorted by
+        # cell, so the members of any cell are one contiguous slice of order and
+        # the candidates for each neighbouring cell can be gathered in bulk.
+        positions = self.positions
+        num = len(positions)
+        reach = self.cutoff + self.skin
+        nx = max(1, int(self.width // reach))
+        ny = max(1, int(self.height // reach))
+        cx = np.clip((positions[:, 0] * (nx / self.width)).astype(np.intp), 0, nx - 1)
+        cy = np.clip((positions[:, 1] * (ny / self.height)).astype(np.intp), 0, ny - 1)
+        cell = cx * ny + cy
+        order = np.argsort(cell, kind="stable")
+        sorted_cells = cell[order]
+        starts = np.searchsorted(sorted_cells, np.arange(nx * ny))
+        ends = np.searchsorted(sorted_cells, np.arange(nx * ny), side="right")
+
+        pair_i, pair_j = [], []
+        particles = np.arange(num)
+        for dx, dy in HALF_NEIGHBOURS:
+            ncx, ncy = cx + dx, cy + dy
+            valid = (ncx >= 0) & (ncx < nx) & (ncy >= 0) & (ncy < ny)
+            neighbour = np.where(valid, ncx * ny + ncy, 0)
+            first = starts[neighbour]
+            counts = np.where(valid, ends[neighbour] - first, 0)
+            total = counts.sum()
+            if total == 0:
+                continue
+            # Index of every candidate in order: first[k], first[k] + 1, ... for each particle k.
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            i = np.repeat(particles, counts)
+            j = order[np.repeat(first, counts) + offsets]
+            if (dx, dy) == (0, 0):
+                keep = i < j
+                i, j = i[keep], j[keep]
+            pair_i.append(i)
+            pair_j.append(j)
+
+        if pair_i:
+            i, j = np.concatenate(pair_i), np.concatenate(pair_j)
+            d = np.take(positions, j, axis=0) - np.take(positions, i, axis=0)
+            close = np.einsum("ij,ij->i", d, d) < reach * reach
+            self.pair_i, self.pair_j = i[close], j[close]
+        else:
+            self.pair_i = self.pair_j = np.empty(0, dtype=np.intp)
+        self.reference = positions.copy()
+        self.rebuilds += 1
+
+    def pair_separations(self):
+        # Vectors from i to j and squared distances for every listed pair. take()
+        # gathers whole rows much faster than fancy indexing does.
+        d = np.take(self.positions, self.pair_j, axis=0) - np.take(self.positions, self.pair_i, axis=0)
+        return d, np.einsum("ij,ij->i", d, d)
+
+    def compute_forces(self):
+        # Pair forces over the neighbour list, accumulated per particle with
+        # bincount. Pairs in the list but beyond the cutoff contribute nothing.
+        num = len(self.positions)
+        d, r2 = self.pair_separations()
+        inv2 = (self.sigma * self.sigma) / r2
+        inv6 = inv2 * inv2 * inv2
+        # Force on j is scale * d and the force on i is its opposite.
+        scale = (24 * self.epsilon) * (2 * inv6 - 1) * inv6 / r2
+        scale *= r2 < self.cutoff * self.cutoff
+        # Pairs pushed deep into each other, as when the box is squeezed, get
+        # the force at the core distance instead of an unbounded one.
+        np.minimum(scale, self.core_scale, out=scale)
+        forces = np.empty((num, 2))
+        for axis in range(2):
+            f = scale * d[:, axis]
+            forces[:, axis] = np.bincount(self.pair_j, weights=f, minlength=num) - np.bincount(self.pair_i, weights=f, minlength=num)
+        return forces
+
+    def potential_energy(self):
+        # Shifted to zero at the cutoff, so the total energy does not jump when
+        # a pair crosses it. The forces are unaffected by the shift.
+        _, r2 = self.pair_separations()
+        inv6 = (self.sigma * self.sigma / r2[r2 < self.cutoff * self.cutoff]) ** 3
+        shift = (self.sigma / self.cutoff) ** 6
+        return float(np.sum(4 * self.epsilon * (inv6 * inv6 - inv6 - shift * shift + shift)))
+
+    def kinetic_energy(self):
+        return float(0.5 * np.sum(self.velocities * self.velocities))
+
+    def substep(self, h):
+        positions, velocities = self.positions, self.velocities
+        velocities += 0.5 * h * self.forces
+        positions += h * velocities
+
+        # Elastic walls, as in the ideal gas engine.
+        below = positions < self.lower
+        above = positions > self.upper
+        np.subtract(2 * self.lower, positions, out=positions, where=below)
+        np.subtract(2 * self.upper, positions, out=positions, where=above)
+        np.negative(velocities, out=velocities, where=below | above)
+
+        moved = positions - self.reference
+        if np.einsum("ij,ij->i", moved, moved).max(initial=0.0) > (0.5 * self.skin) ** 2:
+            self.build_neighbours()
+        self.forces = self.compute_forces()
+        velocities += 0.5 * h * self.forces
+        self.time += h
+
+    def scale_velocities(self, factor):
+        self.velocities *= factor
+
+    def resize(self, width, height):
+        # Move the walls, carrying the particles along, then rebuild the
+        # neighbour list and forces for the new spacing.
+        rescale_positions(self.positions, self.radius, (self.width, self.height), (width, height))
+        self.width = float(width)
+        self.height = float(height)
+        self.upper[:] = [self.width - self.radius, self.height - self.radius]
+        self.build_neighbours()
+        self.forces = self.compute_forces()
+
+    def step(self, dt=1.0):
+        top_speed = math.sqrt(np.einsum("ij,ij->i", self.velocities, self.velocities).max(initial=0.0))
+        h = min(self.timestep, 0.02 * self.sigma / max(top_speed, 1e-9))
+        substeps = max(1, math.ceil(dt / h))
+        h = dt / substeps
+        for _ in range(substeps):
+            self.substep(h)
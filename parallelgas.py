@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from gasengine import IdealGasEngine, free_flight_step
+
+
+def _worker(conn, names, num_particles, start, stop):
+    # Steps particles start:stop of the shared arrays whenever the parent asks.
+    # Each message is (dt, steps, lower, upper); the reply is the momentum this
+    # block handed to the walls. None shuts the worker down.
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    positions = np.ndarray((num_particles, 2), dtype=float, buffer=blocks[0].buf)[start:stop]
+    velocities = np.ndarray((num_particles, 2), dtype=float, buffer=blocks[1].buf)[start:stop]
+    below = np.empty(positions.shape, dtype=bool)
+    above = np.empty(positions.shape, dtype=bool)
+    hits = np.empty(positions.shape, dtype=bool)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            dt, steps, lower, upper = message
+            impulse = 0.0
+            for _ in range(steps):
+                impulse += free_flight_step(positions, velocities, lower, upper, dt, below, above, hits)
+            conn.send(impulse)
+    finally:
+        del positions, velocities
+        for block in blocks:
+            block.close()
+
+
+class ParallelIdealGasEngine(IdealGasEngine):
+    # IdealGasEngine stepped by a pool of worker processes. Positions and
+    # velocities live in multiprocessing.shared_memory blocks, so workers and
+    # the parent all work on the same arrays and nothing is copied per step.
+    #
+    # Ideal gas particles never interact, so there is no halo to exchange and
+    # no particle ever has to migrate between workers: each worker owns a fixed
+    # contiguous block of particles. Every particle goes through exactly the
+    # operations IdealGasEngine.step applies, so positions and velocities match
+    # the single-process engine bit for bit for the same seed. Only the wall
+    # impulse is summed in a different order. Call close() (or use the engine as
+    # a context manager) to stop the workers and free the shared memory.
+    def __init__(self, num_particles, width, height, speed, radius=3.0, seed=None, workers=None):
+        super().__init__(num_particles, width, height, speed, radius, seed)
+        workers = max(1, min(workers or os.cpu_count() or 1, num_particles or 1))
+
+        self.blocks = []
+        for name in ("positions", "velocities"):
+            initial = getattr(self, name)
+            block = shared_memory.SharedMemory(create=True, size=max(initial.nbytes, 1))
+            shared = np.ndarray(initial.shape, dtype=float, buffer=block.buf)
+            shared[:] = initial
+            setattr(self, name, shared)
+            self.blocks.append(block)
+
+        bounds = np.linspace(0, num_particles, workers + 1).astype(int)
+        context = multiprocessing.get_context()
+        self.connections = []
+        self.processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(child_end, [block.name for block in self.blocks], num_particles, start, stop))
+            process.start()
+            child_end.close()
+            self.connections.append(parent_end)
+            self.processes.append(process)
+
+    def step(self, dt=1.0, steps=1):
+        # Run steps steps of length dt on every worker at once. Several steps per
+        # call save a round trip to the workers for each of them.
+        message = (dt, steps, self.lower.copy(), self.upper.copy())
+        for connection in self.connections:
+            connection.send(message)
+        for connection in self.connections:
+            self.wall_impulse += connection.recv()
+        self.time += dt * steps
+
+    def close(self):
+        if not self.blocks:
+            return
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for process in self.processes:
+            process.join()
+        # Keep plain copies so the state stays readable after the blocks go.
+        self.positions = np.array(self.positions)
+        self.velocities = np.array(self.velocities)
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
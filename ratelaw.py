@@ -1,18 +1,97 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
+from kinetics import ReactionNetwork
+from simwindow import FigureWindow
+from sweep import SweepWindow
 
-class FirstOrderRateLawSimulationApp:
+# Reaction mechanisms offered by the simulator, as steps for ReactionNetwork.
+MECHANISMS = {
+    "First order: A -> B": ["A -> B"],
+    "Second order: 2A -> B": ["2A -> B"],
+    "Consecutive: A -> B -> C": ["A -> B", "B -> C"],
+    "Reversible: A <=> B": ["A <=> B"],
+}
+
+# Slider ranges of the rate constant and the initial concentration of A.
+K_RANGE = (0.1, 10.0)
+CONCENTRATION_RANGE = (0.1, 10.0)
+
+
+def initial_concentrations(network, concentration_a):
+    # The first species, and any species no step produces, start at [A]_0; the
+    # rest start at 0. concentration_a may be an array, giving one row each.
+    concentration_a = np.asarray(concentration_a, dtype=float)
+    produced = (network.stoichiometry > 0).any(axis=0)
+    initial = np.where(produced, 0.0, concentration_a[..., None])
+    initial[..., 0] = concentration_a
+    return initial
+
+
+class ScaledSolution:
+    # Every step of the mechanisms here has the same rate constant k and
+    # consumes the same number n of molecules, so the concentrations are
+    # y = [A]_0 * u(tau) with tau = k * [A]_0 ** (n - 1) * t, where u is the
+    # solution for k = [A]_0 = 1. u is integrated once over tau_min..tau_max
+    # and read off by cubic Hermite interpolation, so evaluating it for any
+    # number of k, [A]_0 and times costs one broadcasted expression.
+    def __init__(self, network, tau_min, tau_max, points=60, rtol=1e-4):
+        orders = network.reactant_matrix.sum(axis=1)
+        if orders.min() != orders.max():
+            raise ValueError("Scaled solutions need every step of the mechanism to consume the same number of molecules.")
+        self.order = orders[0]
+        self.tau = np.concatenate(([0.0], np.geomspace(tau_min, tau_max, points)))
+        ones = np.ones((1, network.num_reactions))
+        self.u = network.integrate(initial_concentrations(network, 1.0), ones, self.tau, rtol=rtol, atol=1e-12)[0]
+        self.du = network.derivatives(self.u, ones)
+
+    def scaled_time(self, k, concentration_a, times):
+        # First-order mechanisms leave [A]_0 out of tau, which keeps its shape small.
+        if self.order == 1:
+            return k * times
+        return k * np.asarray(concentration_a, dtype=float) ** (self.order - 1) * times
+
+    def concentrations(self, k, concentration_a, times, species=None):
+        # Concentrations for every combination of k, [A]_0 and time, which must
+        # broadcast against each other. The species are on a new last axis, or
+        # only the species with the given index is returned.
+        concentration_a = np.asarray(concentration_a, dtype=float)
+        tau = self.scaled_time(k, concentration_a, times)
+        i = np.clip(np.searchsorted(self.tau, tau, side="right") - 1, 0, len(self.tau) - 2)
+        h = self.tau[i + 1] - self.tau[i]
+        s = (tau - self.tau[i]) / h
+        u, du = self.u, self.du
+        if species is None:
+            h, s, concentration_a = h[..., None], s[..., None], concentration_a[..., None]
+        else:
+            u, du = u[:, species], du[:, species]
+        values = ((2 * s ** 3 - 3 * s ** 2 + 1) * u[i] + (s ** 3 - 2 * s ** 2 + s) * h * du[i]
+                  + (3 * s ** 2 - 2 * s ** 3) * u[i + 1] + (s ** 3 - s ** 2) * h * du[i + 1])
+        return concentration_a * values
+
+
+def sweep_concentrations(network, k, concentration_a, times, species=None, points=60):
+    # Concentrations for every combination of k, [A]_0 and time through a
+    # ScaledSolution covering just the tau range the grid needs, so a grid of
+    # any size costs one short integration.
+    orders = network.reactant_matrix.sum(axis=1)
+    concentration_a = np.asarray(concentration_a, dtype=float)
+    tau = k * times if orders[0] == 1 else k * concentration_a ** (orders[0] - 1) * times
+    tau_max = max(tau.max(), 1e-12)
+    positive = tau[tau > 0]
+    tau_min = min(positive.min() if positive.size else tau_max, tau_max * 1e-6)
+    return ScaledSolution(network, tau_min, tau_max, points).concentrations(k, concentration_a, times, species)
+
+class FirstOrderRateLawSimulationApp(FigureWindow):
     def __init__(self, master):
         # Initialize the First Order Rate Law Simulation App with a master window.
-        self.master = master
+        super().__init__(master)
         self.master.title("First Order Rate Law Simulation")
 
         # Initialize variables for rate constant and initial concentration of A.
         self.k = tk.DoubleVar(value=1.0)
         self.concentration_a = tk.DoubleVar(value=1.0)
+        self.mechanism = tk.StringVar(value=next(iter(MECHANISMS)))
 
         # Create the user interface components.
         self.create_ui()
@@ -30,38 +109,87 @@ class FirstOrderRateLawSimulationApp:
 
         # Slider for adjusting the rate constant.
         ttk.Label(frame, text="Rate Constant (k):").grid(row=0, column=0, sticky=tk.W)
-        self.k_slider = ttk.Scale(frame, from_=0.1, to=10, variable=self.k, orient=tk.HORIZONTAL, command=self.update_plot)
+        self.k_slider = ttk.Scale(frame, from_=K_RANGE[0], to=K_RANGE[1], variable=self.k, orient=tk.HORIZONTAL, command=self.request_update)
         self.k_slider.grid(row=0, column=1, sticky=tk.EW)
 
         # Slider for adjusting the initial concentration of A.
         ttk.Label(frame, text="Initial Concentration [A]:").grid(row=1, column=0, sticky=tk.W)
-        self.concentration_a_slider = ttk.Scale(frame, from_=0.1, to=10, variable=self.concentration_a, orient=tk.HORIZONTAL, command=self.update_plot)
+        self.concentration_a_slider = ttk.Scale(frame, from_=CONCENTRATION_RANGE[0], to=CONCENTRATION_RANGE[1], variable=self.concentration_a, orient=tk.HORIZONTAL, command=self.request_update)
         self.concentration_a_slider.grid(row=1, column=1, sticky=tk.EW)
 
+        # Mechanism selection. Every step of the mechanism uses the rate constant k.
+        ttk.Label(frame, text="Mechanism:").grid(row=2, column=0, sticky=tk.W)
+        mechanism_box = ttk.Combobox(frame, textvariable=self.mechanism, values=list(MECHANISMS), state="readonly")
+        mechanism_box.grid(row=2, column=1, sticky=tk.EW)
+        mechanism_box.bind("<<ComboboxSelected>>", self.change_mechanism)
+
+        # Sweep mode: [A](t) over a whole grid of k and [A]_0 at once.
+        ttk.Button(frame, text="Sweep...", command=self.open_sweep).grid(row=3, column=0, columnspan=2, pady=5)
+
         frame.columnconfigure(1, weight=1)
 
     def create_plot(self):
-        # Create a plot area.
-        self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.master)
+        # Create a plot area. The concentration lines and the parameter readout
+        # are created once per mechanism and only updated afterwards.
+        self.ax = self.create_figure(self.master)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        self.update_plot()
 
-    def update_plot(self, *args):
-        # Update the plot with current slider values.
+        self.time = np.linspace(0, 10, 200)
+        self.lines = []
+        self.readout = self.animate(self.ax.text(0.97, 0.70, "", transform=self.ax.transAxes, ha="right", va="top"))
+        self.ax.set_xlabel("Time")
+        self.ax.set_ylabel("Concentration")
+        self.ax.set_xlim(self.time[0], self.time[-1])
+        self.change_mechanism()
+
+    def change_mechanism(self, *args):
+        # Build the network for the selected mechanism and one line per species.
+        name = self.mechanism.get()
+        self.network = ReactionNetwork(MECHANISMS[name])
+        self.solution = self.scaled_solution()
+        for line in self.lines:
+            self.remove_artist(line)
+        self.lines = [self.animate(self.ax.plot(self.time, np.zeros_like(self.time), label=f"[{species}](t)")[0])
+                      for species in self.network.species]
+        self.ax.legend(loc="upper right")
+        if name == "First order: A -> B":
+            self.ax.set_title("First Order Rate Law: [A] = [A]_0 * exp(-kt)")
+        else:
+            self.ax.set_title(name)
+        self.invalidate()
+        self.run_update()
+
+    def scaled_solution(self):
+        # One integration per mechanism covering every tau the sliders can
+        # reach, so slider updates only evaluate the interpolant.
+        order = self.network.reactant_matrix.sum(axis=1)[0]
+        scales = [k * c ** (order - 1) for k in K_RANGE for c in CONCENTRATION_RANGE]
+        tau_min = min(scales) * self.time[1]
+        tau_max = max(scales) * self.time[-1]
+        return ScaledSolution(self.network, tau_min, tau_max, points=200, rtol=1e-6)
+
+    def update_state(self):
+        # Concentrations for the current slider values from the scaled solution.
         k = self.k.get()
         concentration_a = self.concentration_a.get()
+        concentrations = self.solution.concentrations(k, concentration_a, self.time)
+        for line, values in zip(self.lines, concentrations.T):
+            line.set_ydata(values)
+        self.readout.set_text(f"k={k:.2f}, [A]_0={concentration_a:.2f}")
 
-        time = np.linspace(0, 10, 500)
-        concentration = concentration_a * np.exp(-k * time)
+        top = self.ax.get_ylim()[1]
+        peak = concentrations.max()
+        if self.needs_full_draw or peak * 1.05 > top or peak * 1.05 < top / 4:
+            # The curves no longer fit the axes nicely: rescale and redraw everything.
+            self.ax.set_ylim(0, peak * 1.25)
+            self.invalidate()
 
-        self.ax.clear()
-        self.ax.plot(time, concentration, label=f"[A](t) with k={k:.2f}, [A]_0={concentration_a:.2f}")
-        self.ax.set_xlabel("Time")
-        self.ax.set_ylabel("Concentration [A]")
-        self.ax.legend()
-        self.ax.set_title("First Order Rate Law: [A] = [A]_0 * exp(-kt)")
-        self.canvas.draw()
+    def open_sweep(self):
+        network = self.network
+        SweepWindow(self.master, f"Rate Law Sweep: {self.mechanism.get()}",
+                    [("k", "Rate Constant (k)", 0.1, 10.0, 1000), ("concentration_a", "Initial Concentration [A]_0", 0.1, 10.0, 1000)],
+                    "Time", self.time, 1.0, "[A]",
+                    lambda k, concentration_a, times: sweep_concentrations(network, k, concentration_a, times, species=0))
 
 if __name__ == "__main__":
     # Create the Tkinter root window and initialize the simulation app.
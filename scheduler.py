@@ -0,0 +1,82 @@
+import time
+
+
+class FixedStepScheduler:
+    # Runs a simulation from the Tk event loop with a fixed physics timestep
+    # that is independent of how often frames are drawn. Elapsed wall-clock
+    # time goes into an accumulator, and each tick runs as many physics steps as
+    # fit into it before drawing one frame, so the simulation keeps real-time
+    # pace even when frames arrive late.
+    #
+    # When a tick overruns the frame interval, the next frame is skipped, though
+    # no more than max_frame_skip in a row, so the physics keeps up. When more
+    # than max_steps_per_frame steps are owed at once, the rest are dropped
+    # rather than letting the backlog grow. The pending after() callback is
+    # cancelled on stop, so starting again never leaves a second loop running.
+    def __init__(self, widget, step, render, timestep=0.02, frame_interval=0.02,
+                 max_steps_per_frame=5, max_frame_skip=2, clock=time.perf_counter):
+        self.widget = widget
+        self.step = step
+        self.render = render
+        self.timestep = timestep
+        self.frame_interval = frame_interval
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_frame_skip = max_frame_skip
+        self.clock = clock
+
+        self.handle = None
+        self.running = False
+        self.steps = 0
+        self.frames = 0
+        self.skipped_frames = 0
+        self.dropped_steps = 0
+
+    def start(self):
+        self.stop()
+        self.running = True
+        self.accumulator = 0.0
+        self.overran = False
+        self.skipped_in_a_row = 0
+        self.last = self.clock()
+        self.render()
+        self.handle = self.widget.after(int(self.frame_interval * 1000), self.tick)
+
+    def stop(self):
+        self.running = False
+        if self.handle is not None:
+            self.widget.after_cancel(self.handle)
+            self.handle = None
+
+    def tick(self):
+        self.handle = None
+        if not self.running:
+            return
+        start = self.clock()
+        self.accumulator += start - self.last
+        self.last = start
+
+        steps = int(self.accumulator // self.timestep)
+        if steps > self.max_steps_per_frame:
+            self.dropped_steps += steps - self.max_steps_per_frame
+            self.accumulator -= (steps - self.max_steps_per_frame) * self.timestep
+            steps = self.max_steps_per_frame
+        for _ in range(steps):
+            self.step()
+        self.accumulator -= steps * self.timestep
+        self.steps += steps
+
+        if steps:
+            if self.overran and self.skipped_in_a_row < self.max_frame_skip:
+                self.skipped_frames += 1
+                self.skipped_in_a_row += 1
+            else:
+                self.render()
+                self.frames += 1
+                self.skipped_in_a_row = 0
+
+        # Wait out whatever is left of the frame interval.
+        elapsed = self.clock() - start
+        self.overran = elapsed > self.frame_interval
+        if self.running:
+            delay = max(1, int((self.frame_interval - elapsed) * 1000))
+            self.handle = self.widget.after(delay, self.tick)
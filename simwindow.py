@@ -0,0 +1,126 @@
+from scheduler import FixedStepScheduler
+
+
+class SimulationWindow:
+    # Base class for the simulator windows. Subclasses put their model update
+    # in update_state() and their drawing in render(), and never call either
+    # directly:
+    #
+    # - request_update() is what slider and widget callbacks call. Any number
+    #   of requests before the next frame are coalesced into one
+    #   update_state() and one render().
+    # - start_animation() runs update_state() at a fixed timestep and render()
+    #   once per frame through a FixedStepScheduler, for simulations that
+    #   evolve on their own; stop_animation() ends it.
+    #
+    # Pending callbacks are cancelled when the window is destroyed.
+    frame_interval = 16  # ms
+
+    def __init__(self, master):
+        self.master = master
+        self.update_pending = None
+        self.scheduler = None
+        self.master.bind("<Destroy>", self.on_destroy, add="+")
+
+    def update_state(self):
+        pass
+
+    def render(self):
+        pass
+
+    def request_update(self, *args):
+        if self.update_pending is None:
+            self.update_pending = self.master.after(self.frame_interval, self.run_update)
+
+    def run_update(self):
+        self.update_pending = None
+        self.update_state()
+        self.render()
+
+    def start_animation(self, timestep=0.02):
+        self.stop_animation()
+        self.scheduler = FixedStepScheduler(self.master, self.update_state, self.render, timestep=timestep)
+        self.scheduler.start()
+
+    def stop_animation(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+
+    @property
+    def animating(self):
+        return self.scheduler is not None and self.scheduler.running
+
+    def on_destroy(self, event):
+        # <Destroy> also fires for every child widget; only the window counts.
+        if event.widget is not self.master:
+            return
+        self.stop_animation()
+        if self.update_pending is not None:
+            self.master.after_cancel(self.update_pending)
+            self.update_pending = None
+
+
+class FigureWindow(SimulationWindow):
+    # A SimulationWindow that draws with matplotlib. create_figure() makes
+    # the one figure and canvas the window keeps for its lifetime. Artists
+    # passed to animate() are left out of full draws and blitted over the
+    # background saved at the last full draw, so render() after an ordinary
+    # update only redraws them. Subclasses call invalidate() when something
+    # static changes (limits, ticks, titles, visibility) and the next render()
+    # does a full draw instead.
+    def __init__(self, master):
+        super().__init__(master)
+        self.figure = None
+        self.canvas = None
+        self.animated = []
+        self.background = None
+        self.needs_full_draw = True
+
+    def create_figure(self, parent, figsize=None, nrows=1, ncols=1):
+        # Returns the axes; the caller places self.canvas.get_tk_widget().
+        # matplotlib is imported here so windows that draw on a Tk canvas do
+        # not load it.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.figure = Figure(figsize=figsize)
+        axes = self.figure.subplots(nrows, ncols)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        return axes
+
+    def animate(self, artist):
+        artist.set_animated(True)
+        self.animated.append(artist)
+        return artist
+
+    def remove_artist(self, artist):
+        if artist in self.animated:
+            self.animated.remove(artist)
+        artist.remove()
+
+    def invalidate(self):
+        self.needs_full_draw = True
+
+    def render(self):
+        if self.needs_full_draw or self.background is None:
+            self.canvas.draw()
+        else:
+            self.blit()
+
+    def on_draw(self, event):
+        # A full draw leaves out the animated artists; keep the static
+        # background it produced for blitting and draw them on top.
+        self.needs_full_draw = False
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_animated()
+
+    def blit(self):
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def draw_animated(self):
+        for artist in self.animated:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
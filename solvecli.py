@@ -0,0 +1,179 @@
+import argparse
+import csv
+import io
+import json
+import math
+import sys
+from itertools import islice
+from solvers import EQUATIONS
+
+
+def to_float(value):
+    # Empty or unparseable fields become NaN so the row is solved as NaN instead
+    # of aborting the whole run.
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class CsvRecords:
+    # CSV rows are kept as plain lists and addressed by column index, which
+    # avoids building a dictionary per row on the way in and on the way out.
+    def __init__(self, source, sink):
+        self.reader = csv.reader(source)
+        self.fields = next(self.reader, [])
+        self.writer = csv.writer(sink, lineterminator="\n")
+        self.sink = sink
+        self.header_written = False
+
+    def __iter__(self):
+        return self.reader
+
+    def missing_variables(self, rows, variables):
+        # The missing variable is the column absent from the header, so a blank
+        # known value in the first row is solved as NaN like in any other row.
+        # Only when every column is present does the first row decide.
+        missing = [var for var in variables if var not in self.fields]
+        if missing or not rows:
+            return missing
+        first = rows[0]
+        return [var for var in variables if self.fields.index(var) >= len(first) or first[self.fields.index(var)] == ""]
+
+    def column(self, rows, var):
+        if var not in self.fields:
+            return [math.nan] * len(rows)
+        index = self.fields.index(var)
+        return [to_float(row[index]) if index < len(row) else math.nan for row in rows]
+
+    def write_header(self, missing_var):
+        # The header goes out with the first chunk, once the solved column is
+        # known, or on its own when the input has no rows.
+        if missing_var is not None and missing_var not in self.fields:
+            self.fields = self.fields + [missing_var]
+        if not self.header_written and self.fields:
+            self.writer.writerow(self.fields)
+            self.header_written = True
+
+    def write(self, rows, missing_var, result):
+        self.write_header(missing_var)
+
+        index = self.fields.index(missing_var)
+        for row, value in zip(rows, result):
+            if len(row) <= index:
+                row.extend([""] * (index + 1 - len(row)))
+            row[index] = "" if math.isnan(value) else value
+        self.writer.writerows(rows)
+        self.sink.flush()
+
+
+class JsonLinesRecords:
+    # Each line is one JSON object; the solved variable is added as a key.
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink = sink
+
+    def __iter__(self):
+        for number, line in enumerate(self.source, start=1):
+            if line.strip():
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {number} is not a JSON object.")
+                yield record
+
+    def write_header(self, missing_var):
+        pass
+
+    def missing_variables(self, records, variables):
+        # JSON Lines has no header: the first record decides.
+        if not records:
+            return []
+        return [var for var in variables if records[0].get(var) in ("", None)]
+
+    def column(self, records, var):
+        return [to_float(record.get(var)) for record in records]
+
+    def write(self, records, missing_var, result):
+        for record, value in zip(records, result):
+            record[missing_var] = None if math.isnan(value) else value
+        self.sink.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        self.sink.flush()
+
+
+def solve_stream(equation, source, sink, fmt="csv", missing_var=None, chunk_size=10000):
+    # Read records from source, solve them chunk by chunk with one vectorized
+    # call per chunk and write them to sink. Memory use is bounded by the chunk
+    # size regardless of the input size. Returns the number of records solved.
+    import numpy as np
+    from batch import solve_batch
+
+    _, variables = EQUATIONS[equation]
+    records = CsvRecords(source, sink) if fmt == "csv" else JsonLinesRecords(source, sink)
+    rows = iter(records)
+    solved = 0
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        if missing_var is None:
+            # The missing variable is the one equation variable absent from the records.
+            missing = records.missing_variables(chunk, variables)
+            if len(missing) != 1:
+                raise ValueError(f"Expected exactly one missing variable for {equation}, got {missing}.")
+            missing_var = missing[0]
+        columns = {var: np.array(records.column(chunk, var)) for var in variables if var != missing_var}
+        records.write(chunk, missing_var, solve_batch(equation, columns, missing_var).tolist())
+        solved += len(chunk)
+
+    if not solved:
+        # No rows: a CSV header still goes out, with the solved column if the
+        # header shows which one it is.
+        if missing_var is None:
+            missing = records.missing_variables([], variables)
+            missing_var = missing[0] if len(missing) == 1 else None
+        records.write_header(missing_var)
+        sink.flush()
+    return solved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve equations for records streamed from CSV or JSON Lines input.")
+    parser.add_argument("equation", nargs="?", help="Name of the equation to solve, as listed by --list.")
+    parser.add_argument("input", nargs="?", default="-", help="Input file, or - for stdin (default).")
+    parser.add_argument("--missing", help="Variable to solve for. Defaults to the one variable missing from the input.")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Input and output format. Defaults to the input file extension, or csv.")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Records solved per vectorized call (default 10000).")
+    parser.add_argument("--list", action="store_true", help="List the available equations and their variables.")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (formula, variables) in EQUATIONS.items():
+            print(f"{name}: {formula}  [{', '.join(variables)}]")
+        return 0
+    if args.equation not in EQUATIONS:
+        parser.error(f"Unknown equation: {args.equation!r}. Use --list to see the available equations.")
+    if args.missing is not None and args.missing not in EQUATIONS[args.equation][1]:
+        parser.error(f"{args.missing!r} is not a variable of {args.equation}.")
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "jsonl" if args.input.endswith((".jsonl", ".json")) else "csv"
+
+    sink = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=True)
+    try:
+        if args.input == "-":
+            source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+            solve_stream(args.equation, source, sink, fmt, args.missing, args.chunk_size)
+        else:
+            with open(args.input, encoding="utf-8", newline="") as source:
+                solve_stream(args.equation, source, sink, fmt, args.missing, args.chunk_size)
+    except ValueError as e:
+        # Input that cannot be solved, such as no single missing variable or a
+        # malformed JSON line: report it without a traceback.
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import math
+from collections import OrderedDict, namedtuple
+from symbolic import load_inverses
+
+# Equations shared by the calculator GUI and any headless caller: the display
+# formula and the variables that can be entered or solved for.
+EQUATIONS = {
+    "Thermodynamics (Gibbs Free Energy)": ("G = H - T*S", ["G", "H", "T", "S"]),
+    "Ideal Gas Law": ("P*V = n*R*T", ["P", "V", "n", "R", "T"]),
+    "Arrhenius Equation": ("k = A*exp(-Ea/(R*T))", ["k", "A", "Ea", "R", "T"]),
+    "Nernst Equation": ("E = E0 - (R*T)/(n*F) * ln(Q)", ["E", "E0", "R", "T", "n", "F", "Q"]),
+    "Rate Law (First Order)": ("ln([A]_t) = -k*t + ln([A]_0)", ["[A]_t", "k", "t", "[A]_0"]),
+    "Clausius Equation (Entropy Change)": ("ΔS = q_rev / T", ["ΔS", "q_rev", "T"]),
+    "Beer-Lambert Law": ("A = epsilon * c * l", ["A", "epsilon", "c", "l"]),
+    "Gibbs Free Energy for Electrochemical Cells": ("ΔG = -n*F*E", ["ΔG", "n", "F", "E"]),
+    "Debye-Hückel Equation": ("gamma_pm = exp(-A * sqrt(I) / (1 + B * a * sqrt(I)))", ["gamma_pm", "A", "I", "B", "a"]),
+    "Schrödinger Equation": ("H * Psi = E * Psi", ["H", "Psi", "E"]),
+    "Heisenberg Uncertainty Principle": ("Δx * Δp >= h_bar / 2", ["Δx", "Δp", "h_bar"]),
+    "Bragg's Law": ("n*lambda = 2*d*sin(theta)", ["n", "lambda", "d", "theta"]),
+    "Clausius-Clapeyron Equation": ("ln(P2/P1) = (ΔHvap/R) * (1/T1 - 1/T2)", ["P1", "P2", "ΔHvap", "R", "T1", "T2"]),
+    "First Law of Thermodynamics": ("ΔU = q + W", ["ΔU", "q", "W"]),
+    "Van der Waals Equation": ("(P + a*n^2/V^2) * (V - n*b) = n*R*T", ["P", "V", "n", "a", "b", "R", "T"]),
+    "Raoult's Law": ("P_solution = X_solvent * P0_solvent", ["P_solution", "X_solvent", "P0_solvent"]),
+    "Hess's Law": ("ΔH_reaction = sum(ΔH_products) - sum(ΔH_reactants)", ["ΔH_reaction", "ΔH_products", "ΔH_reactants"]),
+    "Coulomb's Law": ("F = k_e * (q1 * q2) / r^2", ["F", "k_e", "q1", "q2", "r"]),
+    "Michaelis-Menten Equation": ("v = (Vmax * [S]) / (Km + [S])", ["v", "Vmax", "[S]", "Km"]),
+    "Henderson-Hasselbalch Equation": ("pH = pKa + log([A-]/[HA])", ["pH", "pKa", "[A-]", "[HA]"]),
+    "Avogadro's Law": ("V1/n1 = V2/n2", ["V1", "n1", "V2", "n2"]),
+    "Faraday's Law of Electrolysis": ("m = (Q * M) / (n * F)", ["m", "Q", "M", "n", "F"])
+}
+
+
+def implicit_solver(equation, missing_var):
+    # Pairs with no closed-form inverse are solved numerically in the implicit
+    # module. It needs NumPy, so it is only imported the first time one runs.
+    # Elements the iteration did not converge on come back as NaN, like any
+    # other value outside the domain of the equation.
+    def solver(v):
+        import numpy as np
+        from implicit import IMPLICIT_SOLVERS
+        result, converged = IMPLICIT_SOLVERS[(equation, missing_var)](v)
+        return np.where(converged, result, np.nan)[()]
+    return solver
+
+
+def build_solvers(m):
+    # Build one solver per (equation, missing variable) pair. Each solver takes a
+    # dictionary of the known variable values and returns the missing one. The
+    # math functions come from m, so the same table compiles against the math
+    # module for single values or NumPy ufuncs for whole arrays.
+    #
+    # Inverses are derived from the formula strings (see symbolic.py) and
+    # cached on disk, so a new equation only needs an entry in EQUATIONS.
+    solvers = {}
+    for equation, (formula, variables) in EQUATIONS.items():
+        for var, solver in load_inverses(formula, variables, m).items():
+            solvers[(equation, var)] = solver
+
+    # Variables that appear more than once in their formula cannot be isolated
+    # term by term, so they are solved here. Psi in the Schrödinger equation
+    # cancels out entirely and has no solver.
+    solvers.update({
+        # sqrt(I) = -ln(gamma)/(A + ln(gamma)*B*a); raising its square root to the
+        # fourth power squares it while rejecting the negative, unphysical root.
+        ("Debye-Hückel Equation", "I"): lambda v: m.sqrt(-m.log(v["gamma_pm"]) / (v["A"] + m.log(v["gamma_pm"]) * v["B"] * v["a"])) ** 4,
+        ("Michaelis-Menten Equation", "[S]"): lambda v: (v["v"] * v["Km"]) / (v["Vmax"] - v["v"]),
+        ("Van der Waals Equation", "V"): implicit_solver("Van der Waals Equation", "V"),
+        ("Van der Waals Equation", "n"): implicit_solver("Van der Waals Equation", "n"),
+    })
+    return solvers
+
+
+# Solvers for single values, used by the calculator.
+SOLVERS = build_solvers(math)
+
+
+def solve(equation, missing_var, values):
+    # Look up the solver for this pair and evaluate it on the known values.
+    try:
+        solver = SOLVERS[(equation, missing_var)]
+    except KeyError:
+        raise ValueError(f"No solver for {missing_var} in {equation}.") from None
+    return solver(values)
+
+
+# Counters reported by SolverCache.info(), in the style of functools.lru_cache.
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class SolverCache:
+    # Bounded LRU cache in front of solve(), keyed on the equation, the missing
+    # variable and the known values. Values are rounded to a relative tolerance
+    # before forming the key, so near-identical parameter sets share one entry;
+    # a tolerance of 0 keys on the exact values.
+    def __init__(self, maxsize=1024, tolerance=1e-12):
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.known = {}
+
+    def key(self, equation, missing_var, values):
+        pair = (equation, missing_var)
+        known = self.known.get(pair)
+        if known is None:
+            known = self.known[pair] = [var for var in EQUATIONS[equation][1] if var != missing_var]
+        exact = tuple([values[var] for var in known])
+        if not self.tolerance:
+            return pair, exact
+        # Round the mantissa rather than the value so the tolerance is relative
+        # and works the same for Ea ~ 1e5 as for R ~ 8.314. Infinite and NaN
+        # inputs cannot be rounded and are keyed exactly.
+        scale = 1 / self.tolerance
+        try:
+            return pair, tuple([(round(mantissa * scale), exponent) for mantissa, exponent in map(math.frexp, exact)])
+        except (OverflowError, ValueError):
+            return pair, exact
+
+    def __call__(self, equation, missing_var, values):
+        key = self.key(equation, missing_var, values)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        result = solve(equation, missing_var, values)
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,134 @@
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+def parameter_axes(ranges):
+    # One linspace per (low, high, count) range, shaped to broadcast against
+    # each other along their own axis, plus a trailing axis left for x.
+    values = [np.linspace(low, high, int(count)) for low, high, count in ranges]
+    shaped = []
+    for axis, axis_values in enumerate(values):
+        shape = [1] * (len(values) + 1)
+        shape[axis] = len(axis_values)
+        shaped.append(axis_values.reshape(shape))
+    return values, shaped
+
+
+class SweepWindow:
+    # A window that evaluates a simulator over a whole grid of parameter
+    # values at once. evaluate(*parameters, x) must broadcast: it receives one
+    # array per parameter, each varying along its own axis, and the x values
+    # along the last axis, and returns the result for every combination.
+    #
+    # The heatmap shows the result at one x value over the first two
+    # parameters; any further parameters are taken at their first grid value.
+    # The curve family shows the result over x for up to max_curves values of
+    # the first parameter. Both, with the parameter grids, can be exported to
+    # a .npz file.
+    def __init__(self, master, title, parameters, x_label, x_values, x_default, value_label, evaluate, max_curves=10):
+        # parameters holds (name, label, low, high, count) for every swept
+        # parameter; the name is the key of its grid in exported files.
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.parameters = parameters
+        self.x_label = x_label
+        self.x_values = np.asarray(x_values, dtype=float)
+        self.value_label = value_label
+        self.evaluate = evaluate
+        self.max_curves = max_curves
+
+        frame = ttk.Frame(self.window)
+        frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=10)
+        for column, heading in enumerate(("", "From", "To", "Points")):
+            ttk.Label(frame, text=heading).grid(row=0, column=column, padx=5)
+        self.range_vars = []
+        for row, (_, label, low, high, count) in enumerate(parameters, start=1):
+            ttk.Label(frame, text=label).grid(row=row, column=0, padx=5, pady=2, sticky=tk.W)
+            range_vars = (tk.DoubleVar(value=low), tk.DoubleVar(value=high), tk.IntVar(value=count))
+            for column, var in enumerate(range_vars, start=1):
+                ttk.Entry(frame, textvariable=var, width=10).grid(row=row, column=column, padx=5, pady=2)
+            self.range_vars.append(range_vars)
+
+        row = len(parameters) + 1
+        ttk.Label(frame, text=f"Heatmap at {x_label}:").grid(row=row, column=0, padx=5, pady=2, sticky=tk.W)
+        self.x_var = tk.DoubleVar(value=x_default)
+        ttk.Entry(frame, textvariable=self.x_var, width=10).grid(row=row, column=1, padx=5, pady=2)
+        ttk.Button(frame, text="Run Sweep", command=self.run).grid(row=row + 1, column=0, pady=5)
+        ttk.Button(frame, text="Export...", command=self.export).grid(row=row + 1, column=1, pady=5)
+        self.status = ttk.Label(frame, text="")
+        self.status.grid(row=row + 1, column=2, columnspan=2, sticky=tk.W)
+
+        # One figure for the lifetime of the window; runs only update its artists.
+        self.figure = Figure(figsize=(10, 4.5))
+        self.heatmap_ax, self.family_ax = self.figure.subplots(1, 2)
+        self.image = self.heatmap_ax.imshow(np.zeros((2, 2)), origin="lower", aspect="auto", cmap="viridis")
+        self.figure.colorbar(self.image, ax=self.heatmap_ax).set_label(value_label)
+        self.heatmap_ax.set_xlabel(parameters[1][1] if len(parameters) > 1 else "")
+        self.heatmap_ax.set_ylabel(parameters[0][1])
+        self.family_ax.set_xlabel(x_label)
+        self.family_ax.set_ylabel(value_label)
+        self.family_lines = []
+        self.figure.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        self.results = None
+        self.run()
+
+    def run(self):
+        try:
+            ranges = [tuple(var.get() for var in range_vars) for range_vars in self.range_vars]
+            x = self.x_var.get()
+        except tk.TclError:
+            messagebox.showerror("Error", "Sweep ranges must be numbers.", parent=self.window)
+            return
+        if any(count < 1 for _, _, count in ranges):
+            messagebox.showerror("Error", "Every parameter needs at least one point.", parent=self.window)
+            return
+
+        start = time.perf_counter()
+        values, shaped = parameter_axes(ranges)
+        # Heatmap: the whole grid at the chosen x, in one broadcasted call.
+        grid = self.evaluate(*shaped, np.array([x]))[..., 0]
+        grid = np.broadcast_to(grid, tuple(len(v) for v in values))
+        heatmap = grid.reshape(grid.shape[:2] + (-1,))[..., 0] if grid.ndim > 1 else grid[:, None]
+
+        # Curve family: a few values of the first parameter over every x.
+        first = values[0][np.unique(np.linspace(0, len(values[0]) - 1, self.max_curves).astype(int))]
+        family_axes = [first.reshape(-1, 1)] + [v[:1].reshape(1, 1) for v in values[1:]]
+        family = np.broadcast_to(self.evaluate(*family_axes, self.x_values[None, :]), (len(first), len(self.x_values)))
+        elapsed = time.perf_counter() - start
+
+        self.results = {"grid": grid, "heatmap_x": x, "family": family, "family_parameter": first, "x": self.x_values}
+        for (name, _, _, _, _), axis_values in zip(self.parameters, values):
+            self.results[name] = axis_values
+        self.show(values, heatmap, first, family)
+        self.status.configure(text=f"{grid.size} grid points and {len(first)} curves in {elapsed * 1000:.1f} ms")
+
+    def show(self, values, heatmap, first, family):
+        columns = values[1] if len(values) > 1 else np.array([0.0])
+        self.image.set_data(heatmap)
+        self.image.set_extent((columns[0], columns[-1], values[0][0], values[0][-1]))
+        self.image.set_clim(np.nanmin(heatmap), np.nanmax(heatmap))
+        self.heatmap_ax.set_title(f"{self.value_label} at {self.x_label} = {self.x_var.get():g}")
+
+        for line in self.family_lines:
+            line.remove()
+        colors = self.image.cmap(np.linspace(0, 1, len(first)))
+        self.family_lines = [self.family_ax.plot(self.x_values, curve, color=color, label=f"{value:.3g}")[0]
+                             for value, curve, color in zip(first, family, colors)]
+        self.family_ax.relim()
+        self.family_ax.autoscale_view()
+        self.family_ax.legend(title=self.parameters[0][1], fontsize=7, title_fontsize=7, loc="best")
+        self.canvas.draw_idle()
+
+    def export(self):
+        if self.results is None:
+            return
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".npz", filetypes=[("NumPy arrays", "*.npz")])
+        if path:
+            np.savez(path, **self.results)
@@ -0,0 +1,244 @@
+import ast
+import copy
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+
+# Bump whenever the generated code changes shape so stale cache files are ignored.
+GENERATOR_VERSION = 2
+
+# Where generated solver modules are kept between runs.
+CACHE_DIR = os.environ.get("SOLVER_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "__solvercache__"))
+
+# Generated modules already loaded in this process, keyed by formula hash.
+_loaded = {}
+
+
+def _namespace_call(name, *args):
+    return ast.Call(func=ast.Attribute(value=ast.Name(id="m", ctx=ast.Load()), attr=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+def _formula_call(name, *args):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+def _binop(left, op, right):
+    # Fold a - (-b) into a + b so moving negated terms across stays readable.
+    if isinstance(op, (ast.Add, ast.Sub)) and isinstance(right, ast.UnaryOp) and isinstance(right.op, ast.USub):
+        op = ast.Sub() if isinstance(op, ast.Add) else ast.Add()
+        right = right.operand
+    return ast.BinOp(left=left, op=op, right=right)
+
+
+# How each function that may appear in a formula is emitted as code, in terms of
+# the math namespace m the solvers are built against. Angles are entered in
+# degrees in the calculator.
+EMITTERS = {
+    "exp": lambda arg: _namespace_call("exp", arg),
+    "ln": lambda arg: _namespace_call("log", arg),
+    "log": lambda arg: _namespace_call("log10", arg),
+    "sqrt": lambda arg: _namespace_call("sqrt", arg),
+    "sin": lambda arg: _namespace_call("sin", _namespace_call("radians", arg)),
+    "asin": lambda arg: _namespace_call("degrees", _namespace_call("asin", arg)),
+    "sum": lambda arg: arg,
+}
+
+# Formula functions taking two arguments. pow only comes from isolating a
+# variable under a fractional power, never from an entered formula.
+BINARY_EMITTERS = {
+    "pow": lambda base, exponent: _namespace_call("pow", base, exponent),
+}
+
+# The inverse of each formula function, applied to the other side of the
+# equation while isolating a variable. A sum over a single entered value is
+# the value itself.
+INVERSES = {
+    "exp": lambda other: _formula_call("ln", other),
+    "ln": lambda other: _formula_call("exp", other),
+    "log": lambda other: _binop(ast.Constant(10), ast.Pow(), other),
+    "sqrt": lambda other: _binop(other, ast.Pow(), ast.Constant(2)),
+    "sin": lambda other: _formula_call("asin", other),
+    "sum": lambda other: other,
+}
+
+
+def formula_key(formula, variables):
+    # Cache key for a formula. The Python version is part of it because the
+    # cached modules are stored alongside their compiled bytecode.
+    text = "\0".join([str(GENERATOR_VERSION), sys.implementation.cache_tag or "", formula] + list(variables))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_formula(formula, variables):
+    # Parse "lhs = rhs" into two expression trees. Variable names such as "[A]_t"
+    # or "lambda" are not valid Python names, so each is swapped for a
+    # placeholder before parsing; the returned mapping turns them back.
+    placeholders = {}
+    names = sorted(variables, key=len, reverse=True)
+    out = []
+    i = 0
+    while i < len(formula):
+        for name in names:
+            if not formula.startswith(name, i):
+                continue
+            # Only match whole names, so "E" does not match inside "E0".
+            before = formula[i - 1] if i > 0 else ""
+            after = formula[i + len(name)] if i + len(name) < len(formula) else ""
+            if (name[0].isidentifier() and (before.isalnum() or before == "_")) or \
+               ((name[-1].isalnum() or name[-1] == "_") and (after.isalnum() or after == "_")):
+                continue
+            placeholder = f"_v{variables.index(name)}"
+            placeholders[placeholder] = name
+            out.append(placeholder)
+            i += len(name)
+            break
+        else:
+            out.append(formula[i])
+            i += 1
+
+    # The inequality in the uncertainty principle is solved at its boundary.
+    sides = re.split(r">=|<=|=", "".join(out).replace("^", "**"))
+    if len(sides) != 2:
+        raise ValueError(f"Formula must have exactly one '=': {formula!r}")
+    lhs, rhs = (ast.parse(side.strip(), mode="eval").body for side in sides)
+    return lhs, rhs, placeholders
+
+
+def _count(node, target):
+    return sum(1 for child in ast.walk(node) if isinstance(child, ast.Name) and child.id == target)
+
+
+def isolate(lhs, rhs, target):
+    # Rearrange lhs = rhs into target = expression by undoing the operations
+    # around the target one at a time. Only works when the target appears
+    # exactly once; returns None otherwise.
+    if _count(lhs, target) + _count(rhs, target) != 1:
+        return None
+    side, other = (lhs, rhs) if _count(lhs, target) else (rhs, lhs)
+
+    while not (isinstance(side, ast.Name) and side.id == target):
+        if isinstance(side, ast.BinOp):
+            in_left = _count(side.left, target) > 0
+            left, right, op = side.left, side.right, type(side.op)
+            if op is ast.Add:
+                other = _binop(other, ast.Sub(), right if in_left else left)
+            elif op is ast.Sub:
+                other = _binop(other, ast.Add(), right) if in_left else _binop(left, ast.Sub(), other)
+            elif op is ast.Mult:
+                other = _binop(other, ast.Div(), right if in_left else left)
+            elif op is ast.Div:
+                other = _binop(other, ast.Mult(), right) if in_left else _binop(left, ast.Div(), other)
+            elif op is ast.Pow and in_left:
+                # Roots go through the namespace rather than **, which turns a
+                # negative base into a complex number: math raises on it and
+                # NumPy gives NaN, like every other domain error.
+                if isinstance(right, ast.Constant) and right.value == 2:
+                    other = _formula_call("sqrt", other)
+                elif isinstance(right, ast.Constant):
+                    other = _formula_call("pow", other, ast.Constant(1 / right.value))
+                else:
+                    other = _formula_call("pow", other, _binop(ast.Constant(1), ast.Div(), right))
+            elif op is ast.Pow:
+                other = _binop(_formula_call("ln", other), ast.Div(), _formula_call("ln", left))
+            else:
+                return None
+            side = left if in_left else right
+        elif isinstance(side, ast.UnaryOp) and isinstance(side.op, (ast.USub, ast.UAdd)):
+            if isinstance(side.op, ast.USub):
+                other = ast.UnaryOp(op=ast.USub(), operand=other)
+            side = side.operand
+        elif isinstance(side, ast.Call) and isinstance(side.func, ast.Name) and side.func.id in INVERSES:
+            other = INVERSES[side.func.id](other)
+            side = side.args[0]
+        else:
+            return None
+    return other
+
+
+class _Emitter(ast.NodeTransformer):
+    # Turns a formula-level expression into code: placeholders become lookups in
+    # the values dictionary v and formula functions become calls on m.
+    def __init__(self, placeholders):
+        self.placeholders = placeholders
+
+    def visit_Name(self, node):
+        if node.id in self.placeholders:
+            return ast.Subscript(value=ast.Name(id="v", ctx=ast.Load()), slice=ast.Constant(self.placeholders[node.id]), ctx=ast.Load())
+        raise ValueError(f"Unknown name in formula: {node.id!r}")
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in EMITTERS and len(node.args) == 1:
+            return EMITTERS[node.func.id](self.visit(node.args[0]))
+        if isinstance(node.func, ast.Name) and node.func.id in BINARY_EMITTERS and len(node.args) == 2:
+            return BINARY_EMITTERS[node.func.id](*(self.visit(arg) for arg in node.args))
+        raise ValueError(f"Unsupported function in formula: {ast.unparse(node.func)!r}")
+
+
+def derive_inverses(formula, variables):
+    # Source code of the solver for every variable that can be isolated, keyed
+    # by variable name. Variables that cannot be isolated are left out.
+    lhs, rhs, placeholders = parse_formula(formula, variables)
+    emitter = _Emitter(placeholders)
+    inverses = {}
+    for placeholder, name in sorted(placeholders.items(), key=lambda item: variables.index(item[1])):
+        expression = isolate(lhs, rhs, placeholder)
+        if expression is not None:
+            inverses[name] = ast.unparse(ast.fix_missing_locations(emitter.visit(copy.deepcopy(expression))))
+    return inverses
+
+
+def generate_module(formula, variables):
+    # Source of a module whose build(m) returns the derived solvers for a formula.
+    lines = [
+        f"# Generated by symbolic.py from {formula!r}. Do not edit.",
+        "",
+        "",
+        "def build(m):",
+        "    return {",
+    ]
+    for name, source in derive_inverses(formula, variables).items():
+        lines.append(f"        {name!r}: lambda v: {source},")
+    lines.append("    }")
+    return "\n".join(lines) + "\n"
+
+
+def _import_module(name, path):
+    # Importing through the normal loader lets Python keep the compiled
+    # bytecode in __pycache__, so later runs skip compiling too.
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_inverses(formula, variables, m):
+    # Derived solvers for a formula built against the math namespace m. The
+    # generated module is cached on disk by formula hash, so the derivation
+    # only runs the first time a formula is seen.
+    key = formula_key(formula, variables)
+    module = _loaded.get(key)
+    if module is None:
+        name = f"inverses_{key}"
+        path = os.path.join(CACHE_DIR, name + ".py")
+        if not os.path.exists(path):
+            source = generate_module(formula, variables)
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                # Write to a temporary file first so concurrent starts never
+                # import a half-written module.
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(source)
+                os.replace(tmp_path, path)
+            except OSError:
+                # Read-only installs still work, just without the cache.
+                namespace = {}
+                exec(compile(source, f"<{name}>", "exec"), namespace)
+                module = type(sys)(name)
+                module.build = namespace["build"]
+        if module is None:
+            module = _import_module(name, path)
+        _loaded[key] = module
+    return module.build(m)
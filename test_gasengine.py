@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from gasengine import IdealGasEngine, SpeedHistogram
+
+
+@pytest.mark.parametrize("speed", [5.0, 86.0, 193.0, 1000.0])
+def test_particles_stay_in_small_box(speed):
+    # The smallest box the volume slider reaches, at speeds up to many box
+    # widths per step: every particle stays inside, no energy is lost, and the
+    # measured pressure follows the ideal gas law.
+    engine = IdealGasEngine(80, 67.1, 67.1, speed, radius=3, seed=1)
+    energy = np.sum(engine.velocities ** 2)
+    for _ in range(300):
+        engine.step()
+        assert np.all((engine.positions >= engine.lower) & (engine.positions <= engine.upper))
+    assert np.sum(engine.velocities ** 2) == pytest.approx(energy, rel=1e-12)
+    expected = engine.num_particles * engine.temperature() / engine.area()
+    assert engine.measured_pressure() == pytest.approx(expected, rel=0.05)
+
+
+def test_speed_histogram_counts_speeds_above_range():
+    # Half the samples are beyond max_speed: they get no bar but still count,
+    # so the bars integrate to the fraction of samples in range.
+    histogram = SpeedHistogram(10, 1.0, window=5)
+    velocities = np.array([[0.25, 0.0], [0.0, 0.75], [3.0, 0.0], [0.0, -2.0]])
+    for _ in range(8):
+        histogram.update(velocities)
+    density = histogram.density()
+    assert density.sum() * (1.0 / 10) == pytest.approx(0.5)
+    assert density[2] == density[7] == pytest.approx(0.25 / 0.1)
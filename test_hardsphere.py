@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from hardsphere import HardSphereEngine
+
+
+def check_invariants(engine, energy):
+    # No two discs overlap, none has left the box and no energy was gained
+    # or lost in the elastic collisions.
+    positions = engine.positions
+    tolerance = 1e-6
+    assert np.all(positions >= engine.radius - tolerance)
+    assert np.all(positions[:, 0] <= engine.width - engine.radius + tolerance)
+    assert np.all(positions[:, 1] <= engine.height - engine.radius + tolerance)
+    separation = np.linalg.norm(positions[:, None, :] - positions[None, :, :], axis=2)
+    np.fill_diagonal(separation, np.inf)
+    assert separation.min() >= engine.diameter - tolerance
+    assert np.sum(engine.velocities ** 2) == pytest.approx(energy, rel=1e-9)
+
+
+@pytest.mark.parametrize("num_particles, steps", [(80, 50), (400, 200)])
+def test_step_keeps_discs_apart_and_inside(num_particles, steps):
+    # The simulation window's defaults: a 350 px box and discs of radius 3.
+    engine = HardSphereEngine(num_particles, 350, 350, 8.6, radius=3, seed=2)
+    energy = np.sum(engine.velocities ** 2)
+    for _ in range(steps):
+        time = engine.time
+        engine.step(1.0)
+        assert engine.time == pytest.approx(time + 1.0)
+        check_invariants(engine, energy)
+    assert engine.collisions > 0
+
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from implicit import _vdw_residual, polynomial_roots, solve_bracketed, vdw_moles, vdw_volume
+
+R = 0.0821  # L atm / (mol K)
+
+
+def gas_rows(rng, size):
+    # Real-gas constants and states, including cold, dense rows where the
+    # cubic has three real roots.
+    return {
+        "a": rng.uniform(0.1, 10.0, size),
+        "b": rng.uniform(0.01, 0.1, size),
+        "R": np.full(size, R),
+        "T": rng.uniform(150.0, 600.0, size),
+        "P": rng.uniform(0.5, 80.0, size),
+        "n": rng.uniform(0.1, 5.0, size),
+    }
+
+
+def real_roots(coefficients):
+    roots = np.roots(coefficients)
+    return roots[np.abs(roots.imag) <= 1e-7 * np.maximum(1, np.abs(roots.real))].real
+
+
+def test_polynomial_roots_match_numpy():
+    rng = np.random.default_rng(0)
+    c = rng.normal(size=(4, 500))
+    roots = polynomial_roots(*c)
+    for row in range(c.shape[1]):
+        expected = np.sort(real_roots(c[:, row]))
+        found = np.sort(roots[:, row][np.isfinite(roots[:, row])])
+        np.testing.assert_allclose(found, expected, rtol=1e-7, atol=1e-9)
+
+
+def test_solve_bracketed():
+    roots, converged = solve_bracketed(lambda x: x * x - 2, np.array([0.0, 2.0]), np.array([2.0, 3.0]))
+    assert converged.tolist() == [True, False]
+    assert roots[0] == pytest.approx(np.sqrt(2), rel=1e-12)
+    assert np.isnan(roots[1])
+
+
+def test_vdw_volume_picks_largest_root_above_excluded_volume():
+    rng = np.random.default_rng(1)
+    rows = gas_rows(rng, 400)
+    V, converged = vdw_volume(rows)
+    assert converged.all()
+    P, n, a, b, T = (rows[k] for k in ("P", "n", "a", "b", "T"))
+    assert np.all(np.abs(_vdw_residual(P, V, n, a, b, R, T)) <= 1e-8)
+
+    several = 0
+    for i in range(len(V)):
+        roots = real_roots([P[i], -n[i] * (P[i] * b[i] + R * T[i]), a[i] * n[i] ** 2, -a[i] * b[i] * n[i] ** 3])
+        roots = roots[roots > n[i] * b[i]]
+        several += len(roots) > 1
+        assert V[i] == pytest.approx(roots.max(), rel=1e-7)
+    assert several > 0
+
+
+def test_vdw_moles_picks_smallest_positive_root_below_v_over_b():
+    rng = np.random.default_rng(2)
+    rows = gas_rows(rng, 400)
+    rows["V"] = vdw_volume(rows)[0]
+    n_true = rows.pop("n")
+    n, converged = vdw_moles(rows)
+    assert converged.all()
+    P, V, a, b, T = (rows[k] for k in ("P", "V", "a", "b", "T"))
+    assert np.all(np.abs(_vdw_residual(P, V, n, a, b, R, T)) <= 1e-8)
+
+    for i in range(len(n)):
+        roots = real_roots([-a[i] * b[i] / V[i] ** 2, a[i] / V[i], -(P[i] * b[i] + R * T[i]), P[i] * V[i]])
+        roots = roots[(roots > 0) & (roots < V[i] / b[i])]
+        assert n[i] == pytest.approx(roots.min(), rel=1e-7)
+    # The gas-phase volume solved for above gives back the amount it came from.
+    np.testing.assert_allclose(n, n_true, rtol=1e-7)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from kinetics import ReactionNetwork
+
+
+def test_first_order_matches_exponential_decay():
+    network = ReactionNetwork(["A -> B"])
+    times = np.linspace(0, 5, 21)
+    k = np.array([[0.5], [1.0], [4.0]])
+    y = network.integrate([2.0, 0.0], k, times, rtol=1e-8, atol=1e-12)
+    expected = 2.0 * np.exp(-k * times)
+    np.testing.assert_allclose(y[:, :, 0], expected, rtol=1e-6, atol=1e-10)
+    np.testing.assert_allclose(y.sum(axis=2), 2.0, rtol=1e-10)
+
+
+def test_second_order_matches_closed_form():
+    # 2A -> B at rate k*[A]^2 uses up two A each time: [A] = A0 / (1 + 2*k*A0*t).
+    network = ReactionNetwork(["2A -> B"])
+    times = np.linspace(0, 10, 41)
+    initial = np.array([[0.5, 0.0], [3.0, 0.0]])
+    y = network.integrate(initial, [[1.5]], times, rtol=1e-8, atol=1e-12)
+    a0 = initial[:, :1]
+    np.testing.assert_allclose(y[:, :, 0], a0 / (1 + 2 * 1.5 * a0 * times), rtol=1e-6)
+    np.testing.assert_allclose(y[:, :, 0] + 2 * y[:, :, 1], np.broadcast_to(a0, (2, len(times))), rtol=1e-10)
+
+
+def test_robertson_stiff_problem():
+    # The classic stiff benchmark: rate constants spanning nine orders of
+    # magnitude. Reference values at t = 40 from Hairer and Wanner.
+    network = ReactionNetwork(["A -> B", "2B -> B + C", "B + C -> A + C"])
+    y = network.integrate([1.0, 0.0, 0.0], [0.04, 3e7, 1e4], [40.0], rtol=1e-6, atol=1e-12)[0, -1]
+    np.testing.assert_allclose(y, [0.7158270687, 9.185534764e-6, 0.2841637457], rtol=1e-4)
+    assert y.sum() == pytest.approx(1.0, rel=1e-9)
+
+
+def test_zero_and_repeated_output_times():
+    network = ReactionNetwork(["A -> B"])
+    times = [0.0, 0.0, 1.0, 1.0, 1.0, 2.5, 2.5]
+    y = network.integrate([1.0, 0.0], [[1.0]], times, rtol=1e-8, atol=1e-12)[0]
+    np.testing.assert_array_equal(y[0], [1.0, 0.0])
+    np.testing.assert_array_equal(y[1], [1.0, 0.0])
+    np.testing.assert_array_equal(y[2], y[3])
+    np.testing.assert_array_equal(y[3], y[4])
+    np.testing.assert_array_equal(y[5], y[6])
+    np.testing.assert_allclose(y[[2, 5], 0], np.exp(-np.array([1.0, 2.5])), rtol=1e-6)
+
+
+def test_only_zero_output_time_returns_initial_state():
+    network = ReactionNetwork(["A <=> B"])
+    y = network.integrate([[1.0, 0.0], [0.2, 0.8]], [1.0, 2.0], [0.0])
+    np.testing.assert_array_equal(y[:, 0], [[1.0, 0.0], [0.2, 0.8]])
+
+
+def test_decreasing_output_times_are_rejected():
+    with pytest.raises(ValueError):
+        ReactionNetwork(["A -> B"]).integrate([1.0, 0.0], [1.0], [0.0, 2.0, 1.0])
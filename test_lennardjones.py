@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from lennardjones import LennardJonesEngine
+
+
+def random_engine(num_particles, width, height, seed):
+    # An engine whose particles are placed uniformly at random, overlaps and
+    # all, rather than on the starting lattice.
+    engine = LennardJonesEngine(1, width, height, 5.0, seed=seed)
+    engine.positions = engine.rng.uniform((0, 0), (width, height), size=(num_particles, 2))
+    engine.velocities = np.zeros((num_particles, 2))
+    engine.build_neighbours()
+    return engine
+
+
+def brute_force_pairs(engine):
+    positions = engine.positions
+    reach = engine.cutoff + engine.skin
+    d = positions[None, :, :] - positions[:, None, :]
+    i, j = np.nonzero(np.triu(np.einsum("ijk,ijk->ij", d, d) < reach * reach, k=1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+def brute_force_forces(engine):
+    positions = engine.positions
+    forces = np.zeros_like(positions)
+    for i in range(len(positions)):
+        for j in range(i + 1, len(positions)):
+            d = positions[j] - positions[i]
+            r2 = d @ d
+            if r2 >= engine.cutoff ** 2:
+                continue
+            inv6 = (engine.sigma ** 2 / r2) ** 3
+            scale = min(24 * engine.epsilon * (2 * inv6 - 1) * inv6 / r2, engine.core_scale)
+            forces[j] += scale * d
+            forces[i] -= scale * d
+    return forces
+
+
+@pytest.mark.parametrize("num_particles, width, height, seed", [
+    (300, 350, 350, 0),
+    (300, 120, 80, 1),
+    (60, 10, 200, 2),   # narrower than one cell
+    (40, 10, 12, 3),    # a single cell
+])
+def test_cell_list_matches_brute_force(num_particles, width, height, seed):
+    engine = random_engine(num_particles, width, height, seed)
+    pairs = list(zip(engine.pair_i.tolist(), engine.pair_j.tolist()))
+    unordered = {(min(i, j), max(i, j)) for i, j in pairs}
+    assert len(unordered) == len(pairs)
+    assert unordered == brute_force_pairs(engine)
+    np.testing.assert_allclose(engine.compute_forces(), brute_force_forces(engine), rtol=1e-9, atol=1e-9)
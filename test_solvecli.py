@@ -0,0 +1,28 @@
+import io
+import pytest
+from solvecli import solve_stream
+
+
+def run(text, fmt="csv"):
+    sink = io.StringIO()
+    solved = solve_stream("Ideal Gas Law", io.StringIO(text), sink, fmt)
+    return solved, sink.getvalue()
+
+
+def test_blank_value_in_first_row_is_solved_as_nan():
+    solved, output = run("P,V,n,R\n1,,1,0.0821\n1,22.4,1,0.0821\n")
+    lines = output.splitlines()
+    assert solved == 2
+    assert lines[0] == "P,V,n,R,T"
+    assert lines[1] == "1,,1,0.0821,"
+    assert float(lines[2].split(",")[-1]) == pytest.approx(22.4 / 0.0821)
+
+
+def test_header_only_input_writes_header():
+    assert run("P,V,n,R\n") == (0, "P,V,n,R,T\n")
+
+
+@pytest.mark.parametrize("line", ["[1, 2]", "3", '"P"'])
+def test_json_line_that_is_not_an_object_is_rejected(line):
+    with pytest.raises(ValueError, match="Line 2"):
+        run('{"P": 1, "V": 22.4, "n": 1, "R": 0.0821}\n' + line + "\n", fmt="jsonl")
@@ -0,0 +1,73 @@
+import ast
+import copy
+import math
+import random
+import numpy as np
+import pytest
+import symbolic
+from batch import solve_batch
+from solvers import EQUATIONS, SOLVERS, solve
+from symbolic import _Emitter, parse_formula
+
+
+def test_negative_radicand_is_rejected():
+    # r = sqrt(k_e*q1*q2/F) has no real value for a negative force: the
+    # calculator raises and a batch row comes back as NaN, never complex.
+    values = {"F": -1.0, "k_e": 8.99e9, "q1": 1e-6, "q2": 1e-6}
+    with pytest.raises(ValueError):
+        solve("Coulomb's Law", "r", values)
+    result = solve_batch("Coulomb's Law", {name: np.array([value, abs(value)]) for name, value in values.items()}, "r")
+    assert np.isnan(result[0])
+    assert result[1] == pytest.approx(np.sqrt(8.99e9 * 1e-12))
+
+
+def forward(formula, variables, values):
+    # Both sides of a formula evaluated with the math module.
+    lhs, rhs, placeholders = parse_formula(formula, variables)
+    emitter = _Emitter(placeholders)
+    sides = []
+    for side in (lhs, rhs):
+        expression = ast.fix_missing_locations(ast.Expression(emitter.visit(copy.deepcopy(side))))
+        sides.append(eval(compile(expression, "<formula>", "eval"), {"m": math, "v": values}))
+    return sides
+
+
+@pytest.mark.parametrize("equation, missing_var", sorted(SOLVERS))
+def test_inverse_satisfies_formula(equation, missing_var):
+    # Every solver's answer, put back into its formula, balances it. Known
+    # values of either sign are drawn until one set lies inside the domain of
+    # the solver; outside it a solver must raise, never return a complex.
+    formula, variables = EQUATIONS[equation]
+    rng = random.Random(f"{equation}/{missing_var}")
+    for _ in range(200):
+        values = {var: rng.choice((-1, 1)) * rng.uniform(0.1, 0.9) for var in variables if var != missing_var}
+        try:
+            result = solve(equation, missing_var, dict(values))
+        except (ValueError, ZeroDivisionError):
+            continue
+        assert not isinstance(result, complex), values
+        if math.isfinite(result):
+            values[missing_var] = result
+            break
+    else:
+        pytest.fail(f"No known values in the domain of the {missing_var} solver.")
+    lhs, rhs = forward(formula, variables, values)
+    assert lhs == pytest.approx(rhs, rel=1e-9, abs=1e-12)
+
+
+def test_cached_module_follows_formula(tmp_path, monkeypatch):
+    # A changed formula is a new cache key, so its module is generated again
+    # instead of the stale one being reused.
+    monkeypatch.setattr(symbolic, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(symbolic, "_loaded", {})
+    assert symbolic.load_inverses("y = 2*x", ["y", "x"], math)["x"]({"y": 6.0}) == 3.0
+    assert len(list(tmp_path.glob("inverses_*.py"))) == 1
+    assert symbolic.load_inverses("y = 3*x", ["y", "x"], math)["x"]({"y": 6.0}) == 2.0
+    assert len(list(tmp_path.glob("inverses_*.py"))) == 2
+
+    # So is a new generator version, for modules generated by older code.
+    key = symbolic.formula_key("y = 3*x", ["y", "x"])
+    monkeypatch.setattr(symbolic, "GENERATOR_VERSION", symbolic.GENERATOR_VERSION + 1)
+    assert symbolic.formula_key("y = 3*x", ["y", "x"]) != key
+    assert symbolic.load_inverses("y = 3*x", ["y", "x"], math)["x"]({"y": 6.0}) == 2.0
+    assert len(list(tmp_path.glob("inverses_*.py"))) == 3
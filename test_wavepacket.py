@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from wavepacket import SplitStepWavepacket
+
+# A coarser grid than the simulator's keeps the tests fast; it still resolves
+# the packets below many times over.
+GRID = dict(grid_size=2 ** 12, length=120.0)
+
+
+def norm(packet):
+    return packet.position_density().sum() * packet.spacing
+
+
+def test_free_packet_spreads_as_predicted():
+    packet = SplitStepWavepacket(1.0, "free", dt=0.01, **GRID)
+    delta_x, delta_p = packet.spreads()
+    assert delta_x == pytest.approx(1.0, rel=1e-6)
+    assert delta_p == pytest.approx(0.5, rel=1e-6)
+    for _ in range(4):
+        packet.step(100)
+        delta_x, delta_p = packet.spreads()
+        assert delta_x == pytest.approx(np.sqrt(1 + (packet.time / 2) ** 2), rel=1e-6)
+        # A free packet's momentum distribution never changes.
+        assert delta_p == pytest.approx(0.5, rel=1e-6)
+
+
+@pytest.mark.parametrize("potential", ["free", "harmonic", "barrier"])
+def test_norm_is_conserved(potential):
+    packet = SplitStepWavepacket(0.5, potential, x0=-5.0, p0=2.0, **GRID)
+    assert norm(packet) == pytest.approx(1.0, rel=1e-9)
+    packet.step(1000)
+    assert norm(packet) == pytest.approx(1.0, rel=1e-9)
+    # The momentum density is normalized on its own grid too.
+    dp = 2 * np.pi / (packet.grid_size * packet.spacing)
+    assert packet.momentum_density().sum() * dp == pytest.approx(1.0, rel=1e-9)
+
+
+def test_harmonic_coherent_state_keeps_minimum_uncertainty():
+    # The ground-state width for x^2 / 2 is 1/sqrt(2); displaced and kicked,
+    # the packet oscillates without changing shape.
+    packet = SplitStepWavepacket(1 / np.sqrt(2), "harmonic", x0=3.0, p0=1.0, **GRID)
+    for _ in range(10):
+        packet.step(130)
+        delta_x, delta_p = packet.spreads()
+        assert delta_x == pytest.approx(1 / np.sqrt(2), rel=1e-4)
+        assert delta_x * delta_p == pytest.approx(0.5, rel=1e-4)
@@ -0,0 +1,142 @@
+import struct
+import numpy as np
+
+# File layout: a fixed-size header followed by frames stored back to back.
+# Every frame holds the positions and then the velocities of all particles as
+# an array of shape (2, N, 2), so frame k starts at HEADER_SIZE + k * frame
+# size and the header only needs the frame count to index the whole file.
+MAGIC = b"GASTRAJ\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIQQddd16s")
+HEADER_SIZE = 128
+
+
+class TrajectoryWriter:
+    # Appends frames to a trajectory file through a memory map. The file grows
+    # one chunk of chunk_frames frames at a time, and only the current chunk
+    # is mapped, so recording costs the same however long the run gets. The
+    # frame count in the header is updated on flush() and close(), and every
+    # filled chunk is flushed, so a file being recorded can already be
+    # replayed up to the last flush.
+    def __init__(self, path, num_particles, dt=1.0, width=0.0, height=0.0, dtype=np.float32, chunk_frames=256):
+        self.path = path
+        self.num_particles = int(num_particles)
+        self.dt = float(dt)
+        self.width = float(width)
+        self.height = float(height)
+        self.dtype = np.dtype(dtype)
+        self.chunk_frames = int(chunk_frames)
+        self.frame_shape = (2, self.num_particles, 2)
+        self.frame_bytes = self.dtype.itemsize * 4 * self.num_particles
+
+        self.file = open(path, "w+b")
+        self.frame_count = 0
+        self.capacity = 0
+        self.chunk = None
+        self.chunk_start = 0
+        self.write_header()
+
+    def write_header(self):
+        header = HEADER.pack(MAGIC, VERSION, self.num_particles, self.frame_count, self.dt,
+                             self.width, self.height, self.dtype.str.encode("ascii"))
+        self.file.seek(0)
+        self.file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def grow(self):
+        # Extend the file by one chunk and map just that chunk, flushing the
+        # chunk that has just filled up first.
+        if self.chunk is not None:
+            self.flush()
+        self.chunk_start = self.capacity
+        self.capacity += self.chunk_frames
+        self.file.truncate(HEADER_SIZE + self.capacity * self.frame_bytes)
+        self.chunk = np.memmap(self.file, dtype=self.dtype, mode="r+", offset=HEADER_SIZE + self.chunk_start * self.frame_bytes,
+                               shape=(self.chunk_frames,) + self.frame_shape)
+
+    def append(self, positions, velocities):
+        if self.frame_count == self.capacity:
+            self.grow()
+        frame = self.chunk[self.frame_count - self.chunk_start]
+        frame[0] = positions
+        frame[1] = velocities
+        self.frame_count += 1
+
+    def flush(self):
+        if self.chunk is not None:
+            self.chunk.flush()
+        self.write_header()
+        self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.chunk = None
+        # Drop the unused tail of the last chunk.
+        self.file.truncate(HEADER_SIZE + self.frame_count * self.frame_bytes)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TrajectoryReader:
+    # Memory-maps a trajectory file read-only. Frames are views into the map,
+    # so seeking to any frame is O(1) and only the pages actually read are
+    # loaded, however large the file is.
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a trajectory file.")
+        magic, version, num_particles, frame_count, dt, width, height, dtype = HEADER.unpack_from(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a trajectory file.")
+        if version != VERSION:
+            raise ValueError(f"{path} has unsupported trajectory version {version}.")
+
+        self.path = path
+        self.num_particles = num_particles
+        self.dt = dt
+        self.width = width
+        self.height = height
+        self.dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+        self.frames = np.memmap(path, dtype=self.dtype, mode="r", offset=HEADER_SIZE,
+                                shape=(frame_count, 2, num_particles, 2)) if frame_count else np.empty((0, 2, num_particles, 2), self.dtype)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        # Positions and velocities of one frame, as views into the file.
+        frame = self.frames[index]
+        return frame[0], frame[1]
+
+
+class TrajectoryPlayer:
+    # Plays a recording back through the engine interface the simulation
+    # window uses, so the renderer and scheduler work unchanged: step() moves
+    # to the next frame and positions is the current frame. Playback stops on
+    # the last frame.
+    def __init__(self, reader):
+        self.reader = reader
+        self.width = reader.width
+        self.height = reader.height
+        self.seek(0)
+
+    @property
+    def num_particles(self):
+        return self.reader.num_particles
+
+    def seek(self, index):
+        self.index = min(max(index, 0), max(len(self.reader) - 1, 0))
+        if len(self.reader):
+            self.positions, self.velocities = self.reader[self.index]
+        else:
+            self.positions = self.velocities = np.empty((0, 2))
+
+    def step(self, dt=1.0):
+        self.seek(self.index + 1)